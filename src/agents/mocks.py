@@ -0,0 +1,45 @@
+"""
+Mock agents for development and testing
+Only imported when CBAGENT_MOCK is set - keeps the mock code out of the
+normal import path
+"""
+
+
+class MockTechnicalAgent:
+    """Mock agent for testing when Codex CLI is not available"""
+
+    def __init__(self, api_key: str = None, model: str = None, repo_path=None):
+        """Accepts the same arguments as TechnicalAgent (all ignored)"""
+        self.repo_path = repo_path
+
+    async def analyze_query(self, user_query: str) -> str:
+        """Return mock technical analysis"""
+        return f"""Technical Analysis for query: {user_query}
+
+File: src/components/PaymentButton.tsx
+
+Imports:
+import React from 'react';
+import {{ useState }} from 'react';
+
+Definition:
+export const PaymentButton = (props) => {{
+  const {{ amount, onSuccess, onError }} = props;
+  // Implementation details...
+  return <button>Process Payment</button>;
+}}
+
+Usage Example:
+import {{ PaymentButton }} from '@/components/PaymentButton';
+
+<PaymentButton
+  amount={{99.99}}
+  onSuccess={{handleSuccess}}
+  onError={{handleError}}
+/>
+
+Dependencies:
+- react (peer dependency)
+- Internal: PaymentProcessor, ValidationUtils
+
+This is mock data for development purposes."""
@@ -3,8 +3,95 @@ Business Translator Agent - Converts technical output to PM-friendly language
 Generates both brief and detailed versions for progressive disclosure
 """
 
-from typing import Tuple
-from openai import AsyncOpenAI
+import asyncio
+import hashlib
+import json
+import os
+import random
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from src.clients.openai_client import get_async_openai
+
+# Prefer orjson for parsing the combined JSON response (C-based, ~3-5x faster
+# than stdlib json); its JSONDecodeError subclasses the stdlib one, so the
+# fallback handling in translate() is unaffected
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# System prompts are multi-KB literals - defined once at module load so the
+# per-call accessors just return the constants
+_COMBINED_SYSTEM_PROMPT = """You are a business communication expert who translates technical code analysis into explanations for Product Managers.
+
+Your task: Create TWO versions of the translation in a single response:
+1. "brief": A 3-4 sentence summary of WHAT the component does and WHY it matters from a business perspective
+2. "detailed": A comprehensive business-friendly explanation covering user-facing functionality, practical scenarios, business constraints, and how it integrates with other features
+
+Rules (apply to both versions):
+- NO technical jargon (props, functions, imports, state, hooks)
+- NO file paths or code syntax - describe WHERE in the product instead (e.g., "checkout flow")
+- Focus on user-facing behavior, business value, and practical implications
+- Use simple, conversational language; analogies are welcome in the detailed version
+- Structure the detailed version with clear sections and bullet points
+- USING THE USER INPUT LANGUAGE TO REPLY
+
+Return your translation in JSON format:
+{
+  "brief": "3-4 sentence business summary here",
+  "detailed": "Comprehensive business explanation here"
+}"""
+
+# The brief and detailed calls share one byte-identical prefix (this system
+# prompt plus the user-input/technical-analysis context message); only a
+# short trailing instruction differs. OpenAI's prompt cache matches on
+# shared leading bytes, so when both versions are requested for the same
+# analysis the prefill for the (large) technical_output is computed once
+# and served from cache on the second call.
+_SHARED_SYSTEM_PROMPT = """You are a business communication expert who translates technical code analysis into explanations for Product Managers.
+
+Rules (always apply):
+- NO technical jargon (props, functions, imports, state, hooks)
+- NO file paths or code syntax - describe WHERE in the product instead (e.g., "checkout flow", "user dashboard")
+- Focus on user-facing behavior, business value, and practical implications
+- Use simple, conversational language
+- Explain in terms that enable business decisions
+- USING THE USER INPUT LANGUAGE TO REPLY
+
+You will receive the user's question and a technical analysis, followed by an instruction naming which version to produce."""
+
+_BRIEF_INSTRUCTION = """Produce the BRIEF version: a 3-4 sentence summary that explains WHAT the component does and WHY it matters from a business perspective, in terms a non-technical person would understand.
+
+Example:
+TECHNICAL: "The PaymentButton component accepts an `amount` prop (type: number) and `onSuccess` callback..."
+BRIEF: "The Payment Button allows customers to complete purchases by clicking to process their payment. It handles the payment amount and notifies the system when the transaction succeeds or fails. This component is used throughout the checkout process."""
+
+_DETAILED_INSTRUCTION = """Produce the DETAILED version: a comprehensive, business-friendly explanation covering:
+1. What the component does (user-facing functionality)
+2. How it's used in the product (practical scenarios)
+3. Important limitations or requirements (business constraints)
+4. How it integrates with other features (business workflows)
+
+Use analogies when helpful and structure with clear sections and bullet points.
+
+Example:
+TECHNICAL: "Located in src/components/PaymentButton.tsx. Imports PaymentProcessor from services/..."
+DETAILED: "The Payment Button is used in the checkout process to finalize customer purchases. It appears on:
+- Shopping cart checkout page
+- Quick buy flows
+- Subscription renewal screens
+
+When clicked, it processes the payment and shows a confirmation message. If the payment fails, it displays an error and allows the customer to try again.
+
+Business Requirements:
+- Must show the exact dollar amount before processing
+- Requires a valid payment method to be selected first
+- Sends confirmation emails automatically on success
+
+This component connects with the payment processing system and customer notification features."""
 
 
 class TranslatorAgent:
@@ -19,9 +106,36 @@ class TranslatorAgent:
     - Generates two versions: brief (3-4 sentences) and detailed
     """
 
-    def __init__(self, api_key: str, model: str = "gpt-5-nano"):
-        self.client = AsyncOpenAI(api_key=api_key)
+    # Cap concurrent OpenAI requests across all instances so gather fan-out
+    # cannot trigger rate-limit storms. Size to the account's RPM tier via
+    # CBAGENT_OPENAI_MAX.
+    _default_sem = asyncio.Semaphore(int(os.getenv("CBAGENT_OPENAI_MAX", "8")))
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-5-nano",
+        client=None,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ):
+        # Shared client - all instances with the same key reuse one
+        # connection pool (and the openai import stays lazy). An explicit
+        # client/semaphore can be injected for testing or custom pooling.
+        self.client = client or get_async_openai(api_key)
         self.model = model
+        self._sem = semaphore or self._default_sem
+        # Process-local LRU of translate() results keyed by input hash -
+        # stores futures so duplicate calls in flight also coalesce
+        self._memo: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self._memo_maxsize = 256
+        # Retry budget for transient OpenAI failures (429s, 5xx, drops)
+        self._max_attempts = 6
+        # System messages never change - build the dicts once instead of
+        # reallocating them on every completion call
+        self._combined_sys_msg = {"role": "system", "content": _COMBINED_SYSTEM_PROMPT}
+        self._shared_sys_msg = {"role": "system", "content": _SHARED_SYSTEM_PROMPT}
+        self._brief_instruction_msg = {"role": "user", "content": _BRIEF_INSTRUCTION}
+        self._detailed_instruction_msg = {"role": "user", "content": _DETAILED_INSTRUCTION}
 
     async def translate(self, technical_output: str, user_input: str) -> Tuple[str, str]:
         """
@@ -33,115 +147,199 @@ class TranslatorAgent:
         Returns:
             Tuple of (brief_summary, detailed_explanation)
         """
+        # Trim oversized Codex dumps before sending - input tokens are paid
+        # on every translation call
+        technical_output = self._compact_technical(technical_output)
+
+        # Memoize per (model, inputs): repeat translations within a session
+        # (re-renders, retries) return instantly, and identical calls already
+        # in flight share one generation
+        memo_key = hashlib.blake2b(
+            (self.model + user_input + technical_output).encode("utf-8"),
+            digest_size=16
+        ).hexdigest()
+
+        existing = self._memo.get(memo_key)
+        if existing is not None:
+            self._memo.move_to_end(memo_key)
+            return await existing
+
+        future: asyncio.Future = asyncio.get_event_loop().create_future()
+        self._memo[memo_key] = future
+        while len(self._memo) > self._memo_maxsize:
+            self._memo.popitem(last=False)
+
+        try:
+            result = await self._translate_uncached(technical_output, user_input)
+        except Exception as e:
+            # Don't cache failures
+            self._memo.pop(memo_key, None)
+            future.set_exception(e)
+            future.exception()
+            raise
+
+        future.set_result(result)
+        return result
+
+    async def _create_with_retry(self, **kwargs):
+        """
+        Call chat.completions.create with bounded retries
+
+        Transient failures (429s, connection drops, 5xx) are retried with
+        randomized exponential backoff instead of aborting the whole
+        translation; the shared semaphore is held only for the duration of
+        each attempt so backoff sleeps do not block other requests.
+        """
+        # Only genuinely transient classes: 429s, connection drops/timeouts
+        # (APITimeoutError subclasses APIConnectionError) and 5xx. Client
+        # errors like bad keys or over-long prompts fail the same way every
+        # attempt and must surface immediately, not after the backoff budget
+        from openai import APIConnectionError, InternalServerError, RateLimitError
+
+        # Stable routing identity: requests from this agent land on the
+        # same server-side shard, which keeps the (identical, leading)
+        # system prompt warm in the provider's prefix cache
+        kwargs.setdefault("user", "cbagent-translator")
+
+        delay = 1.0
+        for attempt in range(self._max_attempts):
+            try:
+                async with self._sem:
+                    return await self.client.chat.completions.create(**kwargs)
+            except (RateLimitError, APIConnectionError, InternalServerError):
+                if attempt == self._max_attempts - 1:
+                    raise
+                # Full jitter keeps simultaneous retries from re-colliding
+                await asyncio.sleep(min(delay, 30.0) * (0.5 + random.random()))
+                delay *= 2
+
+    async def _translate_uncached(self, technical_output: str, user_input: str) -> Tuple[str, str]:
+        """Run the actual translation calls (no memoization)"""
         try:
-            # Generate brief summary
-            brief = await self._generate_brief(technical_output, user_input)
+            # Fuse both versions into a single OpenAI call - the shared
+            # technical_output is encoded and billed once instead of twice
+            return await self._generate_combined(technical_output, user_input)
+
+        except (json.JSONDecodeError, KeyError):
+            # Fall back to the two separate calls if the combined JSON
+            # response is malformed (still concurrent via gather)
+            pass
+        except Exception as e:
+            raise RuntimeError(f"Translation failed: {str(e)}")
 
-            # Generate detailed explanation
-            detailed = await self._generate_detailed(technical_output, user_input)
+        try:
+            brief, detailed = await asyncio.gather(
+                self._generate_brief(technical_output, user_input),
+                self._generate_detailed(technical_output, user_input)
+            )
 
             return brief, detailed
 
         except Exception as e:
             raise RuntimeError(f"Translation failed: {str(e)}")
 
-    async def _generate_brief(self, technical_output: str, user_input: str) -> str:
-        """Generate a brief 3-4 sentence summary"""
-        response = await self.client.chat.completions.create(
+    def _compact_technical(self, text: str, max_chars: int = 6000) -> str:
+        """
+        Deterministically cap the technical analysis size
+
+        Keeps the head and tail of the text (where Codex puts the summary and
+        conclusions) and drops the middle, so translation cost stays bounded
+        even when Codex returns a very large dump.
+
+        Args:
+            text: Technical analysis from TechnicalAgent
+            max_chars: Maximum length to keep (default: 6000)
+
+        Returns:
+            The original text, or a head+tail excerpt if it was too long
+        """
+        if len(text) <= max_chars:
+            return text
+
+        half = max_chars // 2
+        return text[:half] + "\n...[truncated]...\n" + text[-half:]
+
+    async def _generate_combined(self, technical_output: str, user_input: str) -> Tuple[str, str]:
+        """Generate brief and detailed in one structured-JSON call"""
+        response = await self._create_with_retry(
             model=self.model,
+            response_format={"type": "json_object"},
             messages=[
-                {
-                    "role": "system",
-                    "content": self._get_brief_system_prompt()
-                },
+                self._combined_sys_msg,
                 {
                     "role": "user",
                     "content": f"User Input: {user_input}"
-                },
-                {
-                    "role": "user",
-                    "content": f"\n\nTechnical Analysis:\n{technical_output}"
+                               f"\n\nTechnical Analysis:\n{technical_output}"
                 }
             ],
         )
 
-        return response.choices[0].message.content.strip()
+        data = _json_loads(response.choices[0].message.content)
+        return data["brief"].strip(), data["detailed"].strip()
 
-    async def _generate_detailed(self, technical_output: str, user_input: str) -> str:
-        """Generate a detailed business-friendly explanation"""
-        response = await self.client.chat.completions.create(
+    async def stream_brief(self, technical_output: str, user_input: str):
+        """
+        Stream the brief summary, yielding text deltas as they arrive
+
+        Callers that render progressively can show tokens immediately;
+        ''.join(parts) of the yielded deltas gives the final brief.
+        """
+        stream = await self._create_with_retry(
             model=self.model,
+            stream=True,
             messages=[
-                {
-                    "role": "system",
-                    "content": self._get_detailed_system_prompt()
-                },
-                {
-                    "role": "user",
-                    "content": f"User Input: {user_input}"
-                },
-                {
-                    "role": "user",
-                    "content": f"\n\nTechnical Analysis:\n{technical_output}"
-                }
+                self._shared_sys_msg,
+                self._context_msg(technical_output, user_input),
+                self._brief_instruction_msg
             ],
         )
 
-        return response.choices[0].message.content.strip()
-
-    def _get_brief_system_prompt(self) -> str:
-        """System prompt for generating brief summaries"""
-        return """You are a business communication expert who translates technical code analysis into clear summaries for Product Managers.
-
-Your task: Create a brief 3-4 sentence summary that explains WHAT the component does and WHY it matters from a business perspective.
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
 
-Rules:
-- NO technical jargon (props, functions, imports, etc.)
-- NO file paths or code syntax
-- Focus on user-facing behavior and business value
-- Use simple, conversational language
-- Explain in terms a non-technical person would understand
-- USING THE USER INPUT LANGUAGE TO REPLY
-
-Example:
-TECHNICAL: "The PaymentButton component accepts an `amount` prop (type: number) and `onSuccess` callback..."
-BRIEF: "The Payment Button allows customers to complete purchases by clicking to process their payment. It handles the payment amount and notifies the system when the transaction succeeds or fails. This component is used throughout the checkout process."
-
-Now translate the following technical analysis into a brief business summary:"""
-
-    def _get_detailed_system_prompt(self) -> str:
-        """System prompt for generating detailed explanations"""
-        return """You are a business communication expert who translates technical code analysis into comprehensive explanations for Product Managers.
+    @staticmethod
+    def _context_msg(technical_output: str, user_input: str) -> dict:
+        """
+        Build the shared context message holding the analysis to translate
 
-Your task: Create a detailed, business-friendly explanation that covers:
-1. What the component does (user-facing functionality)
-2. How it's used in the product (practical scenarios)
-3. Important limitations or requirements (business constraints)
-4. How it integrates with other features (business workflows)
-5. USING THE USER INPUT LANGUAGE TO REPLY
-
-Rules:
-- Avoid technical terms like "props", "imports", "functions", "state", "hooks"
-- Instead of file paths, describe WHERE in the product (e.g., "checkout flow", "user dashboard")
-- Focus on business logic, user experience, and practical implications
-- Use analogies when helpful
-- Structure with clear sections and bullet points
-- Explain in terms that enable business decisions
+        Both _generate_brief and _generate_detailed place this message (and
+        the shared system prompt) before their differing instruction, so the
+        two requests share a byte-identical prefix for prompt-cache reuse.
+        """
+        return {
+            "role": "user",
+            "content": f"User Input: {user_input}"
+                       f"\n\nTechnical Analysis:\n{technical_output}"
+        }
 
-Example:
-TECHNICAL: "Located in src/components/PaymentButton.tsx. Imports PaymentProcessor from services/..."
-DETAILED: "The Payment Button is used in the checkout process to finalize customer purchases. It appears on:
-- Shopping cart checkout page
-- Quick buy flows
-- Subscription renewal screens
+    async def _generate_brief(self, technical_output: str, user_input: str) -> str:
+        """Generate a brief 3-4 sentence summary"""
+        response = await self._create_with_retry(
+            model=self.model,
+            messages=[
+                self._shared_sys_msg,
+                self._context_msg(technical_output, user_input),
+                self._brief_instruction_msg
+            ],
+        )
 
-When clicked, it processes the payment and shows a confirmation message. If the payment fails, it displays an error and allows the customer to try again.
+        return response.choices[0].message.content.strip()
 
-Business Requirements:
-- Must show the exact dollar amount before processing
-- Requires a valid payment method to be selected first
-- Sends confirmation emails automatically on success
+    async def _generate_detailed(self, technical_output: str, user_input: str) -> str:
+        """Generate a detailed business-friendly explanation"""
+        response = await self._create_with_retry(
+            model=self.model,
+            messages=[
+                self._shared_sys_msg,
+                self._context_msg(technical_output, user_input),
+                self._detailed_instruction_msg
+            ],
+        )
 
-This component connects with the payment processing system and customer notification features."
+        return response.choices[0].message.content.strip()
 
-Now translate the following technical analysis into a detailed business explanation:"""
+    def _get_combined_system_prompt(self) -> str:
+        """System prompt for generating brief + detailed in one call"""
+        return _COMBINED_SYSTEM_PROMPT
@@ -0,0 +1,23 @@
+"""
+Caching module
+Provides LLMCache and backends for caching expensive LLM/Codex responses
+"""
+
+from src.cache.llm_cache import (
+    LLMCache,
+    CacheBackend,
+    MemoryBackend,
+    DiskBackend,
+    make_cache_key,
+)
+from src.cache.cache_manager import CacheManager, CacheEntry
+
+__all__ = [
+    "CacheManager",
+    "CacheEntry",
+    "LLMCache",
+    "CacheBackend",
+    "MemoryBackend",
+    "DiskBackend",
+    "make_cache_key",
+]
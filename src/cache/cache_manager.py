@@ -0,0 +1,443 @@
+"""
+Component Cache Manager
+Persistent disk cache for per-component query results, keyed by component
+and query type and invalidated when the repository HEAD moves
+"""
+
+import functools
+import hashlib
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.cache.llm_cache import _ensure_dir
+
+# Default cache location, resolved once at import instead of building the
+# home-relative Path (and mkdir-ing it) per CacheManager construction
+_DEFAULT_CACHE_DIR = Path.home() / ".cbagent" / "component_cache"
+
+
+def _read_head_sha(repo_path: Path) -> Optional[str]:
+    """
+    Read the HEAD commit SHA directly from the .git directory
+
+    GitPython's Repo() scans config and refs just to answer this one
+    question; a direct read of .git/HEAD, the branch ref it points to, or
+    packed-refs is a couple of small file reads.
+
+    Args:
+        repo_path: Repository root (must contain .git/)
+
+    Returns:
+        40-char HEAD SHA, or None if it cannot be resolved
+    """
+    git_dir = repo_path / ".git"
+
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        return None
+
+    # Detached HEAD: the file holds the SHA itself
+    if not head.startswith("ref: "):
+        return head or None
+
+    ref_name = head[5:]
+
+    # Loose ref file
+    try:
+        return (git_dir / ref_name).read_text().strip()
+    except OSError:
+        pass
+
+    # Packed refs: lines of "<sha> <ref_name>"
+    try:
+        for line in (git_dir / "packed-refs").read_text().splitlines():
+            if line.startswith("#") or line.startswith("^"):
+                continue
+            parts = line.split(" ", 1)
+            if len(parts) == 2 and parts[1].strip() == ref_name:
+                return parts[0]
+    except OSError:
+        pass
+
+    return None
+
+
+def _head_stamp(repo_path: Path) -> tuple:
+    """Cheap change stamp for HEAD: mtimes of HEAD and its ref file"""
+    git_dir = repo_path / ".git"
+    head_file = git_dir / "HEAD"
+
+    try:
+        stamp = [os.stat(head_file).st_mtime_ns]
+        content = head_file.read_text().strip()
+    except OSError:
+        return ()
+
+    if content.startswith("ref: "):
+        ref_file = git_dir / content[5:]
+        try:
+            stamp.append(os.stat(ref_file).st_mtime_ns)
+        except OSError:
+            pass
+
+    return tuple(stamp)
+
+
+class CacheEntry:
+    """Single cached (component, query_type) result"""
+
+    def __init__(
+        self,
+        component: str,
+        query_type: str,
+        git_commit: Optional[str],
+        timestamp: float,
+        brief_output: str,
+        detailed_output: str
+    ):
+        self.component = component
+        self.query_type = query_type
+        self.git_commit = git_commit
+        self.timestamp = timestamp
+        self.brief_output = brief_output
+        self.detailed_output = detailed_output
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON storage"""
+        return {
+            "component": self.component,
+            "query_type": self.query_type,
+            "git_commit": self.git_commit,
+            "timestamp": self.timestamp,
+            "brief_output": self.brief_output,
+            "detailed_output": self.detailed_output
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CacheEntry":
+        """Deserialize from JSON storage"""
+        timestamp = data["timestamp"]
+        if isinstance(timestamp, str):
+            # Entries written before timestamps moved to epoch seconds
+            timestamp = datetime.fromisoformat(timestamp).timestamp()
+
+        return cls(
+            component=data["component"],
+            query_type=data["query_type"],
+            git_commit=data.get("git_commit"),
+            timestamp=timestamp,
+            brief_output=data["brief_output"],
+            detailed_output=data["detailed_output"]
+        )
+
+
+class CacheManager:
+    """
+    Disk cache for translated component answers
+
+    Entries live in a single SQLite database (WAL mode) keyed by
+    (component hash, query type) and are invalidated by TTL and
+    (optionally) whenever the repository HEAD commit changes, so answers
+    never outlive the code they describe.
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        cache_dir: Optional[Path] = None,
+        ttl_days: int = 7,
+        auto_invalidate: bool = True,
+        max_entries: int = 1000
+    ):
+        """
+        Initialize cache manager
+
+        Args:
+            repo_path: Path to the repository the answers describe
+            cache_dir: Cache directory (default: ~/.cbagent/component_cache/)
+            ttl_days: Entry time-to-live in days
+            auto_invalidate: Drop entries whose commit no longer matches HEAD
+            max_entries: Size cap; least-recently-used entries are evicted
+        """
+        self.repo_path = Path(repo_path)
+        self.cache_dir = _ensure_dir(cache_dir or _DEFAULT_CACHE_DIR)
+        self.ttl_days = ttl_days
+        self.auto_invalidate = auto_invalidate
+        self.max_entries = max_entries
+
+        # (sha, head stamp) - refreshed only when .git/HEAD (or the ref it
+        # points to) changes on disk
+        self._commit_cache: Optional[Tuple[Optional[str], tuple]] = None
+
+        # Read-through memory gate: progressive disclosure hits the same
+        # (component, query_type) repeatedly within ms, so repeat lookups
+        # become dict hits instead of database reads
+        self._mem: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()
+        self._mem_maxsize = 1024
+
+        # One connection, one fd, autocommit: every get/set is a single
+        # B-tree lookup instead of an open/read-or-write/close per entry
+        # file. WAL lets concurrent readers proceed during writes;
+        # synchronous=NORMAL skips the per-commit fsync that is overkill
+        # for a rebuildable cache.
+        # check_same_thread=False: async callers run get/set through
+        # asyncio.to_thread worker threads; SQLite itself is compiled in
+        # serialized threading mode, so sharing the connection is safe
+        self._db = sqlite3.connect(
+            self.cache_dir / "cache.db",
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                component_hash TEXT NOT NULL,
+                component TEXT NOT NULL,
+                query_type TEXT NOT NULL,
+                git_commit TEXT,
+                ts REAL NOT NULL,
+                atime REAL NOT NULL,
+                brief TEXT NOT NULL,
+                detailed TEXT NOT NULL,
+                PRIMARY KEY (component_hash, query_type)
+            )
+            """
+        )
+
+        # Batch invalidation: when HEAD moved since the last run, drop every
+        # stale row in one statement here instead of deleting them one at a
+        # time as reads trip over them
+        if self.auto_invalidate:
+            current = self.get_current_commit()
+            if current is not None:
+                self._db.execute(
+                    "DELETE FROM entries WHERE git_commit IS NOT ?", (current,)
+                )
+
+    def get_current_commit(self) -> Optional[str]:
+        """
+        Get the current HEAD commit SHA
+
+        The SHA is cached and only re-read when the mtime of .git/HEAD or
+        the branch ref it points to changes, so bulk cache reads cost one
+        stat instead of re-resolving HEAD each time.
+
+        Returns:
+            40-char HEAD SHA, or None if the path is not a git repository
+        """
+        stamp = _head_stamp(self.repo_path)
+        if self._commit_cache is not None and self._commit_cache[1] == stamp:
+            return self._commit_cache[0]
+
+        sha = _read_head_sha(self.repo_path)
+        self._commit_cache = (sha, stamp)
+        return sha
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _hash_component_name(component: str) -> str:
+        """
+        Short directory-sharding hash for a component name
+
+        blake2b is faster than md5 for short inputs and is not blocked on
+        FIPS-mode Python builds; a 4-byte digest gives the same 8-hex-char
+        directory name as before. Memoized so loops over the same component
+        skip the hash entirely.
+        """
+        return hashlib.blake2b(component.encode("utf-8"), digest_size=4).hexdigest()
+
+    def get(self, component: str, query_type: str) -> Optional[CacheEntry]:
+        """
+        Look up a cached entry
+
+        Args:
+            component: Component name
+            query_type: Query type (usage, restrictions, ...)
+
+        Returns:
+            CacheEntry, or None if absent, expired, or stale
+        """
+        mem_key = (component, query_type)
+        cached = self._mem.get(mem_key)
+        if cached is not None:
+            if self._entry_valid(cached):
+                self._mem.move_to_end(mem_key)
+                # Keep the disk LRU order in sync: without this, entries
+                # hot through the gate look cold to eviction and get
+                # dropped from disk first
+                self._touch(component, query_type)
+                return cached
+            self._mem.pop(mem_key, None)
+
+        # The 4-byte hash only shards; the stored full name must also match
+        # so a hash collision degrades to a miss, never another component's
+        # answer
+        row = self._db.execute(
+            "SELECT component, query_type, git_commit, ts, brief, detailed "
+            "FROM entries WHERE component_hash = ? AND component = ? "
+            "AND query_type = ?",
+            (self._hash_component_name(component), component, query_type)
+        ).fetchone()
+        if row is None:
+            return None
+
+        entry = CacheEntry(
+            component=row[0],
+            query_type=row[1],
+            git_commit=row[2],
+            timestamp=row[3],
+            brief_output=row[4],
+            detailed_output=row[5]
+        )
+
+        if not self._entry_valid(entry):
+            if time.time() - entry.timestamp > self.ttl_days * 86400:
+                self._delete_entry(component, query_type)
+            return None
+
+        # Mark as recently used for LRU eviction
+        self._touch(component, query_type)
+
+        self._mem_store(mem_key, entry)
+        return entry
+
+    def _touch(self, component: str, query_type: str) -> None:
+        """Bump an entry's atime so disk LRU eviction tracks real usage"""
+        self._db.execute(
+            "UPDATE entries SET atime = ? WHERE component_hash = ? "
+            "AND component = ? AND query_type = ?",
+            (time.time(), self._hash_component_name(component), component, query_type)
+        )
+
+    def _entry_valid(self, entry: CacheEntry) -> bool:
+        """
+        Check TTL and commit validity for an entry
+
+        TTL expiry is a single float subtraction per read. Commit-based
+        invalidation matters because answers describe a specific tree
+        state; stale rows are bulk-deleted on startup, so a mid-session
+        commit mismatch just misses and the next startup sweeps them.
+        """
+        if time.time() - entry.timestamp > self.ttl_days * 86400:
+            return False
+
+        if self.auto_invalidate:
+            current = self.get_current_commit()
+            if current is not None and entry.git_commit != current:
+                return False
+
+        return True
+
+    def _mem_store(self, mem_key: Tuple[str, str], entry: CacheEntry) -> None:
+        """Insert into the memory gate, evicting the least recently used"""
+        self._mem[mem_key] = entry
+        self._mem.move_to_end(mem_key)
+        while len(self._mem) > self._mem_maxsize:
+            self._mem.popitem(last=False)
+
+    def set(
+        self,
+        component: str,
+        query_type: str,
+        brief_output: str,
+        detailed_output: str
+    ) -> None:
+        """
+        Store a result for (component, query_type)
+
+        Args:
+            component: Component name
+            query_type: Query type
+            brief_output: Brief translated answer
+            detailed_output: Detailed translated answer
+        """
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries "
+            "(component_hash, component, query_type, git_commit, ts, atime, brief, detailed) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self._hash_component_name(component),
+                component,
+                query_type,
+                self.get_current_commit(),
+                now,
+                now,
+                brief_output,
+                detailed_output
+            )
+        )
+
+        # Bound steady-state size: evict least-recently-used rows beyond cap
+        self._db.execute(
+            "DELETE FROM entries WHERE rowid IN ("
+            "  SELECT rowid FROM entries ORDER BY atime ASC"
+            "  LIMIT MAX(0, (SELECT COUNT(*) FROM entries) - ?)"
+            ")",
+            (self.max_entries,)
+        )
+
+        # Write through to the memory gate
+        self._mem_store(
+            (component, query_type),
+            CacheEntry(
+                component=component,
+                query_type=query_type,
+                git_commit=self.get_current_commit(),
+                timestamp=now,
+                brief_output=brief_output,
+                detailed_output=detailed_output
+            )
+        )
+
+    def clear(self, component: Optional[str] = None) -> None:
+        """
+        Remove cached entries
+
+        Args:
+            component: Only clear this component's entries (default: all)
+        """
+        if component is not None:
+            self._db.execute(
+                "DELETE FROM entries WHERE component_hash = ? AND component = ?",
+                (self._hash_component_name(component), component)
+            )
+            for mem_key in [k for k in self._mem if k[0] == component]:
+                del self._mem[mem_key]
+            return
+
+        self._db.execute("DELETE FROM entries")
+        self._mem.clear()
+
+    def get_stats(self) -> dict:
+        """Return entry count and total size of the cache"""
+        total_entries, total_bytes = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(brief) + LENGTH(detailed)), 0) "
+            "FROM entries"
+        ).fetchone()
+
+        return {
+            "entries": total_entries,
+            "size_bytes": total_bytes,
+            "cache_dir": str(self.cache_dir)
+        }
+
+    def _delete_entry(self, component: str, query_type: str) -> None:
+        """Drop a single stale entry"""
+        self._db.execute(
+            "DELETE FROM entries WHERE component_hash = ? "
+            "AND component = ? AND query_type = ?",
+            (self._hash_component_name(component), component, query_type)
+        )
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self._db.close()
@@ -0,0 +1,425 @@
+"""
+LLM Response Cache
+Caches Codex/LLM responses keyed by a normalized prompt hash so repeated
+(or near-duplicate) queries skip the expensive Codex round-trip entirely
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Protocol, Union
+
+# orjson is ~3-5x faster than stdlib json for the cache-key serialization on
+# the hot path; fall back to stdlib when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional semantic-similarity support (sentence-transformers is heavy and
+# not required for exact-key caching)
+try:
+    from sentence_transformers import SentenceTransformer, util as st_util
+    SEMANTIC_AVAILABLE = True
+except ImportError:
+    SEMANTIC_AVAILABLE = False
+
+# Default cache location, resolved once at import - Path.home() and the
+# mkdir syscalls are skipped on repeat backend constructions (batch
+# evaluation creates one per agent)
+_DEFAULT_CACHE_DIR = Path.home() / ".cbagent" / "cache"
+
+
+@functools.cache
+def _ensure_dir(cache_dir: Path) -> Path:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def make_cache_key(
+    repo_path: Union[Path, str, None],
+    prompt: str,
+    head_sha: Optional[str] = None
+) -> str:
+    """
+    Build a deterministic cache key from the repository path and prompt
+
+    Args:
+        repo_path: Path to the repository being analyzed
+        prompt: Full prompt sent to Codex/LLM
+        head_sha: Repository HEAD commit, if known - including it makes the
+            key content-addressed, so entries from older commits simply
+            stop matching when the tree changes
+
+    Returns:
+        Hex SHA-256 digest of the normalized key data
+    """
+    key_data = {"repo": str(repo_path), "prompt": prompt, "head": head_sha}
+    if orjson is not None:
+        payload = orjson.dumps(key_data, option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(key_data, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class CacheBackend(Protocol):
+    """Protocol that all cache backends must implement"""
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached value for key, or None if absent/expired"""
+        ...
+
+    def set(self, key: str, value: str) -> None:
+        """Store value under key"""
+        ...
+
+    def delete(self, key: str) -> None:
+        """Remove key from the cache (no-op if absent)"""
+        ...
+
+    def clear(self) -> None:
+        """Remove all entries from the cache"""
+        ...
+
+
+class MemoryBackend:
+    """In-process LRU cache backend with optional max size"""
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize memory backend
+
+        Args:
+            maxsize: Maximum number of entries before LRU eviction
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        # Mark as recently used
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def get_timestamp(self, key: str) -> Optional[float]:
+        """Return the insertion timestamp for key, or None if absent"""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def set(self, key: str, value: str) -> None:
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class DiskBackend:
+    """Persistent JSON-file cache backend under ~/.cbagent/cache/"""
+
+    # Signals LLMCache to offload calls to a worker thread so file IO
+    # never blocks the event loop
+    blocking_io = True
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Initialize disk backend
+
+        Args:
+            cache_dir: Directory for cache files (default: ~/.cbagent/cache/)
+        """
+        self.cache_dir = _ensure_dir(cache_dir or _DEFAULT_CACHE_DIR)
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        # Bytes all the way: one read_bytes (no exists() pre-stat, no text
+        # decoding pass) and orjson's C decoder when available - hit
+        # latency on large detailed answers is dominated by this decode
+        try:
+            data = self._path_for(key).read_bytes()
+            entry = orjson.loads(data) if orjson is not None else json.loads(data)
+            return entry["value"]
+        except (ValueError, KeyError, OSError):
+            return None
+
+    def get_timestamp(self, key: str) -> Optional[float]:
+        """Return the stored timestamp for key, or None if absent"""
+        try:
+            data = self._path_for(key).read_bytes()
+            entry = orjson.loads(data) if orjson is not None else json.loads(data)
+            return entry.get("timestamp")
+        except (ValueError, OSError):
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        path = self._path_for(key)
+        entry = {"timestamp": time.time(), "value": value}
+        # Machine-only files: compact separators and raw (unescaped) UTF-8
+        # keep them as small as possible. Write to a temp file and rename so
+        # a crashed write never leaves a truncated entry behind.
+        tmp = path.with_suffix(".tmp")
+        if orjson is not None:
+            tmp.write_bytes(orjson.dumps(entry))
+        else:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def delete(self, key: str) -> None:
+        path = self._path_for(key)
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class LLMCache:
+    """
+    Async cache facade over a CacheBackend with TTL expiry and an optional
+    semantic-similarity fallback for near-duplicate prompts
+
+    Exact hits are served from the backend by key hash. If a
+    SentenceTransformer model is available, near-duplicate queries (cosine
+    similarity above threshold) are also served from cache.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl_seconds: int = 86400,
+        semantic_threshold: float = 0.92,
+        use_semantic: bool = False
+    ):
+        """
+        Initialize LLM cache
+
+        Args:
+            backend: Cache backend (default: MemoryBackend with 1024 entries)
+            ttl_seconds: Time-to-live for entries in seconds (default: 1 day)
+            semantic_threshold: Cosine similarity threshold for semantic hits
+            use_semantic: Enable semantic-similarity lookup (requires
+                sentence-transformers to be installed)
+        """
+        self.backend = backend or MemoryBackend(maxsize=1024)
+        # Disk-style backends flag themselves so their file IO runs in a
+        # worker thread; in-memory backends stay on the loop (a thread hop
+        # would cost more than the dict lookup)
+        self._offload = bool(getattr(self.backend, "blocking_io", False))
+        # Write-behind machinery for blocking backends, created lazily on
+        # the first set() so construction stays loop-free
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self.ttl_seconds = ttl_seconds
+        self.semantic_threshold = semantic_threshold
+        self.stats = {"hits": 0, "misses": 0, "semantic_hits": 0, "synthesized": 0}
+        self._embedder = None
+        self._embeddings: dict = {}  # key -> embedding tensor
+
+        if use_semantic and SEMANTIC_AVAILABLE:
+            self._embedder = SentenceTransformer("all-MiniLM-L6-v2")
+
+    @property
+    def semantic_enabled(self) -> bool:
+        """Whether semantic-similarity lookup is active"""
+        return self._embedder is not None
+
+    async def get(self, key: str, query_text: Optional[str] = None) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Cache key from make_cache_key()
+            query_text: Original query text (enables semantic fallback)
+
+        Returns:
+            Cached response string, or None on miss
+        """
+        if await self._is_expired(key):
+            await self._call(self.backend.delete, key)
+            self._embeddings.pop(key, None)
+        else:
+            value = await self._call(self.backend.get, key)
+            if value is not None:
+                self.stats["hits"] += 1
+                return value
+
+        # Semantic fallback: serve near-duplicate queries from cache
+        if self._embedder is not None and query_text:
+            similar_key = self._find_similar(query_text)
+            if similar_key is not None:
+                self.stats["semantic_hits"] += 1
+                return await self._call(self.backend.get, similar_key)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def _call(self, fn, *args):
+        """Run a backend call, off-loop when the backend does blocking IO"""
+        if self._offload:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def top_similar(
+        self,
+        query_text: str,
+        top_k: int = 3,
+        threshold: float = 0.80
+    ) -> list:
+        """
+        Return cached answers for the top-k queries most similar to query_text
+
+        Used by the generative cache layer: on a near-miss, the best stored
+        snippets can be synthesized into an answer by a cheap LLM call
+        instead of re-running the full analysis.
+
+        Args:
+            query_text: Query to match against indexed queries
+            top_k: Maximum number of answers to return
+            threshold: Minimum cosine similarity to count as related
+
+        Returns:
+            List of cached answer strings, best match first (may be empty)
+        """
+        if self._embedder is None or not self._embeddings:
+            return []
+
+        query_embedding = self._embedder.encode(query_text, convert_to_tensor=True)
+
+        scored = []
+        for key, embedding in self._embeddings.items():
+            score = float(st_util.cos_sim(query_embedding, embedding))
+            if score >= threshold:
+                scored.append((score, key))
+
+        scored.sort(reverse=True)
+
+        answers = []
+        for _, key in scored[:top_k]:
+            value = self.backend.get(key)
+            if value is not None:
+                answers.append(value)
+        return answers
+
+    def record_synthesis(self) -> None:
+        """Count an answer synthesized from cached snippets"""
+        self.stats["synthesized"] += 1
+
+    async def set(self, key: str, value: str, query_text: Optional[str] = None) -> None:
+        """
+        Store a response in the cache
+
+        Args:
+            key: Cache key from make_cache_key()
+            value: Response string to cache
+            query_text: Original query text (indexed for semantic lookup)
+        """
+        if self._offload:
+            # Fire-and-forget: the caller's latency should not include disk
+            # throughput; a background task batches the writes
+            self._enqueue_write(key, value)
+        else:
+            self.backend.set(key, value)
+        if self._embedder is not None and query_text:
+            self._embeddings[key] = self._embedder.encode(
+                query_text, convert_to_tensor=True
+            )
+
+    def _enqueue_write(self, key: str, value: str) -> None:
+        """Queue a backend write, dropping the oldest pending one when full"""
+        if self._write_queue is None:
+            self._write_queue = asyncio.Queue(maxsize=1024)
+            self._writer_task = asyncio.ensure_future(self._drain_writes())
+
+        try:
+            self._write_queue.put_nowait((key, value))
+        except asyncio.QueueFull:
+            # A full queue means disk cannot keep up; losing the oldest
+            # cache write is cheaper than blocking query completion
+            try:
+                self._write_queue.get_nowait()
+                self._write_queue.task_done()
+            except asyncio.QueueEmpty:
+                pass
+            self._write_queue.put_nowait((key, value))
+
+    async def _drain_writes(self) -> None:
+        """Background writer: batch queued entries into one worker-thread hop"""
+        while True:
+            batch = [await self._write_queue.get()]
+            while len(batch) < 32:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+
+    def _write_batch(self, batch: list) -> None:
+        for key, value in batch:
+            self.backend.set(key, value)
+
+    async def flush(self) -> None:
+        """Wait until all queued writes have reached the backend"""
+        if self._write_queue is not None:
+            await self._write_queue.join()
+
+    async def delete(self, key: str) -> None:
+        """Remove a single entry from the cache"""
+        await self._call(self.backend.delete, key)
+        self._embeddings.pop(key, None)
+
+    async def clear(self) -> None:
+        """Remove all entries from the cache"""
+        await self._call(self.backend.clear)
+        self._embeddings.clear()
+
+    async def _is_expired(self, key: str) -> bool:
+        """Check whether the entry for key has exceeded the TTL"""
+        get_timestamp = getattr(self.backend, "get_timestamp", None)
+        if get_timestamp is None:
+            return False
+        timestamp = await self._call(get_timestamp, key)
+        if timestamp is None:
+            return False
+        return (time.time() - timestamp) > self.ttl_seconds
+
+    def _find_similar(self, query_text: str) -> Optional[str]:
+        """Find a cached key whose query is semantically similar"""
+        if not self._embeddings:
+            return None
+
+        query_embedding = self._embedder.encode(query_text, convert_to_tensor=True)
+
+        best_key = None
+        best_score = self.semantic_threshold
+        for key, embedding in self._embeddings.items():
+            score = float(st_util.cos_sim(query_embedding, embedding))
+            if score >= best_score:
+                best_key = key
+                best_score = score
+
+        return best_key
@@ -0,0 +1,10 @@
+"""
+Shared API clients
+Provides process-wide client singletons so connection pools are reused
+"""
+
+from src.clients.openai_client import get_async_openai
+
+__all__ = [
+    "get_async_openai",
+]
@@ -0,0 +1,47 @@
+"""
+Shared AsyncOpenAI client
+One client (and one httpx connection pool, DNS resolver, and TLS context)
+per API key, reused across all agents and judges
+"""
+
+import functools
+
+
+@functools.lru_cache(maxsize=4)
+def get_async_openai(api_key: str):
+    """
+    Get or create the shared AsyncOpenAI client for an API key
+
+    Creating a client per agent instance gives each its own httpx pool and
+    TLS context; sharing one keeps connections warm across translate() and
+    judge calls. Imports are deferred so touching this module stays cheap.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        Shared AsyncOpenAI client instance
+    """
+    from openai import AsyncOpenAI
+
+    # Prefer the aiohttp transport when the openai[aiohttp] extra is
+    # installed - it multiplexes concurrent requests noticeably better
+    # than httpx under fan-out; otherwise use a tuned httpx pool
+    try:
+        from openai import DefaultAioHttpClient
+        http_client = DefaultAioHttpClient()
+    except ImportError:
+        import httpx
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=50,
+                max_keepalive_connections=20
+            )
+        )
+
+    return AsyncOpenAI(
+        api_key=api_key,
+        max_retries=2,
+        timeout=60,
+        http_client=http_client
+    )
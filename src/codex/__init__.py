@@ -4,9 +4,11 @@ Provides CodexExecutor for running OpenAI Codex CLI commands
 """
 
 from .codex_executor import CodexExecutor, CodexResponse, CodexExecutorError, CodexTimeoutError, CodexAuthError
+from .codex_daemon import CodexDaemon
 
 __all__ = [
     "CodexExecutor",
+    "CodexDaemon",
     "CodexResponse",
     "CodexExecutorError",
     "CodexTimeoutError",
@@ -0,0 +1,169 @@
+"""
+Codex Daemon - Long-lived Codex CLI process shared across queries
+Avoids paying the Codex process startup cost on every analyze_query call
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Optional
+
+from src.codex.codex_executor import (
+    CodexExecutorError,
+    CodexTimeoutError,
+)
+
+# The daemon parses one JSON event per output line for the lifetime of the
+# process; orjson does this ~3-5x faster than stdlib json and works on the
+# raw bytes without a decode
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps  # returns bytes
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+class CodexDaemon:
+    """
+    Persistent `codex proto` process with framed JSON request/response
+
+    Instead of spawning the Codex CLI per query (Node/Rust startup every
+    call), the daemon keeps one process alive with open stdin/stdout pipes
+    and serializes requests over it using codex's line-delimited proto
+    framing: submissions ({"id", "op"}) in, events ({"id", "msg"}) out.
+    Use as an async context manager or call start()/close() explicitly.
+    """
+
+    def __init__(self, repo_path: Path, timeout: int = 600):
+        """
+        Initialize the daemon (does not spawn the process yet)
+
+        Args:
+            repo_path: Repository the daemon analyzes
+            timeout: Per-request timeout in seconds
+        """
+        self.repo_path = Path(repo_path)
+        self.timeout = timeout
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+        self._request_id = 0
+
+    async def start(self) -> None:
+        """Spawn the Codex proto process if not already running"""
+        if self._process is not None and self._process.returncode is None:
+            return
+
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                "codex",
+                "proto",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                cwd=str(self.repo_path)
+            )
+        except FileNotFoundError:
+            raise CodexExecutorError(
+                "Codex CLI not found. Please install codex and run 'codex login'."
+            )
+
+    async def request(self, prompt: str) -> str:
+        """
+        Send a prompt to the daemon and await its reply
+
+        Requests are serialized through a lock - the app-server handles one
+        conversation turn at a time over the shared pipes.
+
+        Args:
+            prompt: The analysis query/task for Codex
+
+        Returns:
+            Plain text message from Codex
+
+        Raises:
+            CodexTimeoutError: If the reply exceeds the timeout
+            CodexExecutorError: If the daemon died or replied unusably
+        """
+        await self.start()
+
+        async with self._lock:
+            self._request_id += 1
+            request_id = self._request_id
+
+            message = _json_dumps({
+                "id": request_id,
+                "op": {"type": "user_input", "items": [{"type": "text", "text": prompt}]}
+            })
+
+            self._process.stdin.write(message + b"\n")
+            await self._process.stdin.drain()
+
+            try:
+                return await asyncio.wait_for(
+                    self._read_reply(),
+                    timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                # The daemon is in an unknown state - restart it on next use
+                await self.close()
+                raise CodexTimeoutError(
+                    f"Codex daemon request timed out after {self.timeout} seconds."
+                )
+
+    async def _read_reply(self) -> str:
+        """Read proto event lines until the turn's agent message arrives"""
+        last_message = None
+
+        while True:
+            line = await self._process.stdout.readline()
+            if not line:
+                raise CodexExecutorError("Codex daemon exited unexpectedly")
+
+            try:
+                event = _json_loads(line)
+            except ValueError:
+                continue
+
+            # Proto events are {"id", "msg": {"type", ...}}: track the last
+            # agent_message and return it when task_complete ends the turn
+            msg = event.get("msg") if isinstance(event, dict) else None
+            if not isinstance(msg, dict):
+                continue
+
+            msg_type = msg.get("type")
+            if msg_type == "agent_message" and msg.get("message") is not None:
+                last_message = msg["message"]
+            elif msg_type == "task_complete":
+                # Newer builds echo the final text on the completion event
+                last_message = last_message or msg.get("last_agent_message")
+                if last_message:
+                    return last_message
+                raise CodexExecutorError(
+                    "Codex daemon turn completed without an agent message"
+                )
+            elif msg_type == "error":
+                raise CodexExecutorError(
+                    f"Codex daemon error: {msg.get('message')}"
+                )
+
+    async def close(self) -> None:
+        """Terminate the daemon process"""
+        if self._process is None:
+            return
+
+        if self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+
+        self._process = None
+
+    async def __aenter__(self) -> "CodexDaemon":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
@@ -5,10 +5,52 @@ Manages execution of OpenAI Codex CLI commands for code analysis
 
 import asyncio
 import json
+import os
+import re
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Union
 from datetime import datetime
 
+# Codex event lines are multi-KB JSON blobs; orjson parses them ~3-5x
+# faster than stdlib json and accepts bytes directly
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Fixed command pieces, resolved once at import instead of per call: the
+# codex argv never changes apart from the task
+_CODEX_CMD_PREFIX = ("codex", "exec", "--json")
+_CODEX_CMD_SUFFIX = ("--sandbox", "read-only", "--skip-git-repo-check")
+
+# Codex can emit very long single-line JSON events; the asyncio stream
+# reader's default 64KB line limit would raise on those, so allow up to
+# 1MB per buffered line
+_STREAM_LIMIT = 1024 * 1024
+
+# asyncio.timeout (3.11+) scopes a whole read loop without spawning a
+# wrapper Task per wait like wait_for does; fall back on older runtimes
+_asyncio_timeout = getattr(asyncio, "timeout", None)
+
+# Auth-failure sniffing on raw stderr bytes: one compiled, case-insensitive
+# pass instead of lowering + substring-scanning the decoded text per marker
+_AUTH_ERR_RE = re.compile(rb"not logged in|login|unauthor|401|auth", re.IGNORECASE)
+
+# Global cap on concurrent codex CLI processes, shared across all executor
+# instances - batch evaluation creates several executors, and without a
+# process-wide gate they would fork/exec an unbounded number of CLIs at
+# once. Created lazily so the semaphore binds to the running event loop.
+# Tune via CBAGENT_CODEX_MAX.
+_CODEX_SEM: Optional[asyncio.Semaphore] = None
+
+
+def _get_codex_sem() -> asyncio.Semaphore:
+    global _CODEX_SEM
+    if _CODEX_SEM is None:
+        _CODEX_SEM = asyncio.Semaphore(int(os.getenv("CBAGENT_CODEX_MAX", "4")))
+    return _CODEX_SEM
+
 
 # Error Classes
 class CodexExecutorError(Exception):
@@ -78,24 +120,26 @@ class CodexResponse:
         if self.analysis:
             output_parts.append(f"# Technical Analysis\n\n{self.analysis}")
 
-        # Files analyzed
+        # One list entry per section instead of one per item - fewer
+        # intermediate strings and appends for the final join to walk
         if self.files_analyzed:
-            output_parts.append("\n## Files Analyzed")
-            for file_path in self.files_analyzed:
-                output_parts.append(f"- {file_path}")
+            output_parts.append(
+                "\n## Files Analyzed\n"
+                + "\n".join(f"- {file_path}" for file_path in self.files_analyzed)
+            )
 
-        # Key findings
         if self.key_findings:
-            output_parts.append("\n## Key Findings")
-            for finding in self.key_findings:
-                output_parts.append(f"- {finding}")
+            output_parts.append(
+                "\n## Key Findings\n"
+                + "\n".join(f"- {finding}" for finding in self.key_findings)
+            )
 
-        # Code examples
         if self.code_examples:
             output_parts.append("\n## Code Examples")
-            for i, example in enumerate(self.code_examples, 1):
-                output_parts.append(f"\n### Example {i}")
-                output_parts.append(f"```\n{example}\n```")
+            output_parts.extend(
+                f"\n### Example {i}\n```\n{example}\n```"
+                for i, example in enumerate(self.code_examples, 1)
+            )
 
         return "\n".join(output_parts)
 
@@ -119,16 +163,19 @@ class CodexExecutor:
         """
         self.repo_path = Path(repo_path)
         self.timeout = timeout
+        self._daemon = None  # Lazily created when CBAGENT_CODEX_DAEMON is set
+        self._daemon_unusable = False  # Set when daemon mode fails; falls back to spawns
 
         if not self.repo_path.exists():
             raise ValueError(f"Repository path does not exist: {self.repo_path}")
 
-    async def execute_query(self, prompt: str) -> str:
+    async def execute_query(self, prompt: Union[str, bytes]) -> str:
         """
         Execute Codex CLI with query and return plain text response
 
         Args:
-            prompt: The analysis query/task for Codex
+            prompt: The analysis query/task for Codex (str, or pre-encoded
+                UTF-8 bytes to avoid re-encoding large static prefixes)
 
         Returns:
             Plain text message from Codex (extracted from .msg.message)
@@ -139,76 +186,276 @@ class CodexExecutor:
             CodexParseError: If .msg.message field not found
             CodexExecutorError: For other execution errors
         """
-        # Run Codex CLI and get plain text message
-        return await self._run_codex_cli(prompt)
+        # Opt-in daemon mode: reuse one long-lived Codex process instead of
+        # paying CLI startup on every query
+        if os.getenv("CBAGENT_CODEX_DAEMON") and not self._daemon_unusable:
+            if self._daemon is None:
+                from src.codex.codex_daemon import CodexDaemon
+                self._daemon = CodexDaemon(self.repo_path, timeout=self.timeout)
+            if isinstance(prompt, bytes):
+                prompt = prompt.decode("utf-8")
+            try:
+                return await self._daemon.request(prompt)
+            except CodexAuthError:
+                raise
+            except CodexTimeoutError:
+                # A daemon timeout is indistinguishable from a protocol
+                # hang - do not risk stalling the next query for another
+                # full timeout; surface this one and use per-call spawns
+                # from here on
+                self._daemon_unusable = True
+                self._daemon = None
+                raise
+            except CodexExecutorError:
+                # The installed codex build doesn't speak proto framing
+                # (or the daemon keeps dying) - fall back to per-call spawns
+                # for the rest of the session instead of failing every query
+                self._daemon_unusable = True
+                self._daemon = None
+
+        # Run Codex CLI and get plain text message; the shared semaphore
+        # keeps the process-wide CLI count bounded under concurrent callers
+        async with _get_codex_sem():
+            return await self._run_codex_cli(prompt)
+
+    async def stream_query(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Execute Codex CLI and yield output lines as they arrive
 
+        Unlike execute_query, this does not wait for the full buffered
+        response - downstream consumers can start processing (or rendering)
+        as soon as the first message is available. Events are parsed from
+        the `codex exec --json` ND-JSON stream in-process; only lines that
+        carry a message are yielded.
 
+        Args:
+            prompt: The analysis query/task for Codex
+
+        Yields:
+            Message texts from Codex as they are produced
 
-    async def _run_codex_cli(self, task: str) -> str:
+        Raises:
+            CodexTimeoutError: If no output arrives within the timeout
+            CodexAuthError: If authentication fails
+            CodexParseError: If the stream carried no message
+            CodexExecutorError: For other execution errors
         """
-        Run codex_script.sh with the task/question as argument and capture the returned value
+        async with _get_codex_sem():
+            process = await asyncio.create_subprocess_exec(
+                *_CODEX_CMD_PREFIX,
+                prompt,
+                *_CODEX_CMD_SUFFIX,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(self.repo_path),
+                limit=_STREAM_LIMIT
+            )
+
+            # Drain stderr concurrently (as _run_codex_cli does) so a
+            # chatty process cannot deadlock on a full pipe, and so auth
+            # failures are detectable after the stream ends
+            stderr_task = asyncio.ensure_future(process.stderr.read())
+            produced = False
+
+            try:
+                while True:
+                    try:
+                        line = await asyncio.wait_for(
+                            process.stdout.readline(),
+                            timeout=self.timeout
+                        )
+                    except asyncio.TimeoutError:
+                        raise CodexTimeoutError(
+                            f"Codex query timed out after {self.timeout} seconds. "
+                            "Try a more specific query or increase CODEX_TIMEOUT."
+                        )
+
+                    if not line:
+                        break
+
+                    parsed = self._message_from_line(line)
+                    if parsed is not None and parsed[1]:
+                        produced = True
+                        yield parsed[1]
+
+                await process.wait()
+                stderr = await stderr_task
+
+                # Same post-run checks as _run_codex_cli: auth failures and
+                # message-free runs must raise, not end as an empty stream
+                if process.returncode != 0 and stderr and _AUTH_ERR_RE.search(stderr):
+                    raise CodexAuthError(
+                        "Codex CLI authentication failed. Please run 'codex login'."
+                    )
+
+                if not produced:
+                    error_text = stderr.decode().strip() if stderr else ""
+                    raise CodexParseError(
+                        "No agent message found in Codex output"
+                        + (f" (stderr: {error_text})" if error_text else "")
+                    )
+
+            finally:
+                if not stderr_task.done():
+                    stderr_task.cancel()
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+
+
+
+    async def _run_codex_cli(self, task: Union[str, bytes]) -> str:
+        """
+        Run the codex CLI directly and extract the agent message in-process
+
+        Spawns a single `codex exec --json` process instead of the old
+        bash + codex + jq pipeline (three fork/execs per query) and parses
+        the ND-JSON event stream in Python, so the message field is plucked
+        without re-serializing through jq.
 
         Args:
-            task: The task/prompt for Codex
+            task: The task/prompt for Codex (str or UTF-8 bytes - subprocess
+                arguments accept both)
 
         Returns:
-            Plain text message from the script (already extracted .msg.message by jq)
+            Plain text message from Codex
 
         Raises:
             CodexTimeoutError: If execution times out
             CodexAuthError: If authentication fails
+            CodexParseError: If no message field is found in the output
             CodexExecutorError: For other execution errors
         """
-        # Get the path to the script
-        script_path = Path(__file__).parent / "codex_script.sh"
-
-        if not script_path.exists():
-            raise CodexExecutorError(f"Script not found: {script_path}")
-
-        # Prepare the command - call the bash script with the task as argument
-        cmd = [
-            "bash",
-            str(script_path),
-            task
-        ]
+        cmd = [*_CODEX_CMD_PREFIX, task, *_CODEX_CMD_SUFFIX]
 
         try:
-            # Create subprocess
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                cwd=str(self.repo_path)
+                cwd=str(self.repo_path),
+                limit=_STREAM_LIMIT
             )
 
-            # Wait for completion with timeout
+            # Drain stderr concurrently so a chatty process cannot deadlock
+            # on a full pipe while we read stdout
+            stderr_task = asyncio.ensure_future(process.stderr.read())
+
+            # Read stdout incrementally instead of buffering the whole run
+            # via communicate(): events are parsed as they arrive and only
+            # the rolling last message is kept in memory. The timeout is a
+            # single scope for the whole run rather than a wait_for Task per
+            # line, which matters when many evaluations run concurrently.
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=self.timeout
-                )
-            except asyncio.TimeoutError:
+                if _asyncio_timeout is not None:
+                    async with _asyncio_timeout(self.timeout):
+                        agent_text, msg_text = await self._read_messages(process.stdout)
+                else:
+                    # Python 3.10: one wrapping Task for the whole read loop
+                    agent_text, msg_text = await asyncio.wait_for(
+                        self._read_messages(process.stdout),
+                        timeout=self.timeout
+                    )
+            except (asyncio.TimeoutError, TimeoutError):
                 # Kill the process if it times out
                 process.kill()
+                stderr_task.cancel()
                 await process.wait()
                 raise CodexTimeoutError(
                     f"Codex query timed out after {self.timeout} seconds. "
                     "Try a more specific query or increase CODEX_TIMEOUT."
                 )
 
-            # Get the output from the script
-            output_text = stdout.decode().strip().replace("null\n", "")
-            error_text = stderr.decode().strip() if stderr else ""
+            stderr = await stderr_task
+            await process.wait()
+
+            if process.returncode != 0 and stderr and _AUTH_ERR_RE.search(stderr):
+                raise CodexAuthError(
+                    "Codex CLI authentication failed. Please run 'codex login'."
+                )
 
-            # The script already extracts .msg.message using jq, so just return the output
-            return output_text
+            # An empty or whitespace-only message is as useless downstream as
+            # no message at all - failing here saves the TranslatorAgent an
+            # LLM call on content-free input
+            message = agent_text if agent_text is not None else msg_text
+            if message is None or not message.strip():
+                # Decode stderr only on this error path - the happy path
+                # never needs the text form
+                error_text = stderr.decode().strip() if stderr else ""
+                raise CodexParseError(
+                    "No agent message found in Codex output"
+                    + (f" (stderr: {error_text})" if error_text else "")
+                )
+            return message
 
         except FileNotFoundError:
             raise CodexExecutorError(
-                "Bash or script not found. Please ensure bash is available and the script exists at: "
-                f"{script_path}"
+                "codex CLI not found. Please ensure Codex is installed and on PATH."
             )
         except Exception as e:
             if isinstance(e, (CodexTimeoutError, CodexAuthError, CodexExecutorError)):
                 raise
-            raise CodexExecutorError(f"Unexpected error running Codex script: {str(e)}")
+            raise CodexExecutorError(f"Unexpected error running Codex CLI: {str(e)}")
+
+    async def _read_messages(self, stdout: asyncio.StreamReader) -> tuple:
+        """
+        Consume an ND-JSON event stream to EOF, tracking the last messages
+
+        Args:
+            stdout: Stream of `codex exec --json` output lines
+
+        Returns:
+            (agent_text, msg_text): last agent_message text and last
+            .msg.message fallback seen, either of which may be None
+        """
+        agent_text = None
+        msg_text = None
+
+        while True:
+            line = await stdout.readline()
+            if not line:
+                return agent_text, msg_text
+
+            parsed = self._message_from_line(line)
+            if parsed is not None:
+                kind, text = parsed
+                if kind == "agent":
+                    agent_text = text
+                else:
+                    msg_text = text
+
+    @staticmethod
+    def _message_from_line(line: bytes) -> Optional[tuple]:
+        """
+        Parse one ND-JSON event line into its message payload
+
+        Mirrors the old jq filter: an `agent_message` item wins over the
+        `.msg.message` fallback, which the caller tracks separately.
+
+        Args:
+            line: Single raw line from `codex exec --json` stdout
+
+        Returns:
+            ("agent", text) or ("msg", text), or None if the line carries
+            no message
+        """
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            event = _json_loads(line)
+        except ValueError:
+            return None
+        if not isinstance(event, dict):
+            return None
+
+        item = event.get("item")
+        if isinstance(item, dict) and item.get("type") == "agent_message":
+            return ("agent", item.get("text"))
+
+        msg = event.get("msg")
+        if isinstance(msg, dict) and msg.get("message") is not None:
+            return ("msg", msg["message"])
+
+        return None
+
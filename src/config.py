@@ -3,8 +3,10 @@ Configuration management for PM Component Query System
 Uses Pydantic Settings for environment-based configuration
 """
 
+import functools
+import os
 from pathlib import Path
-from typing import Optional
+from pydantic import PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -24,6 +26,11 @@ class Settings(BaseSettings):
     # Session configuration
     max_retries: int = 3
 
+    # Analysis cache configuration
+    cache_enabled: bool = True
+    cache_dir: Path = Path.home() / ".cbagent" / "cache"
+    cache_ttl_days: int = 7
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -31,8 +38,14 @@ class Settings(BaseSettings):
         extra="ignore"
     )
 
+    # Set once validation has passed so repeat calls skip the filesystem
+    _repo_validated: bool = PrivateAttr(default=False)
+
     def validate_repo_path(self) -> None:
         """Validate that the repository path exists and is either a git repository or contains git repositories"""
+        if self._repo_validated:
+            return
+
         if not self.repo_path.exists():
             raise ValueError(f"Repository path does not exist: {self.repo_path}")
 
@@ -42,34 +55,46 @@ class Settings(BaseSettings):
         # Check if the path itself is a git repository
         git_dir = self.repo_path / ".git"
         if git_dir.exists():
+            self._repo_validated = True
             return  # Valid: path is a git repository
 
-        has_git_repos = any(
-            (item / ".git").exists()
-            for item in self.repo_path.iterdir()
-            if item.is_dir()
-        )
+        # scandir gets entry types from the dirent data (no stat per child)
+        # and lexists is a single syscall per candidate; hidden directories
+        # (.venv, .cache, ...) are never the repos being looked for
+        has_git_repos = False
+        with os.scandir(self.repo_path) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False) and os.path.lexists(
+                    os.path.join(entry.path, ".git")
+                ):
+                    has_git_repos = True
+                    break
 
         if not has_git_repos:
             raise ValueError(
                 f"Repository path is not a git repository and contains no git repositories: {self.repo_path}"
             )
 
+        self._repo_validated = True
+
 
-# Global config instance
-config: Optional[Settings] = None
+# lru_cache instead of a manual global: env-file parsing and field
+# validation run once, re-entry is a dict lookup, and thread safety
+# comes for free
+@functools.lru_cache(maxsize=1)
+def _build_settings() -> Settings:
+    settings = Settings()
+    settings.validate_repo_path()
+    return settings
 
 
 def get_config() -> Settings:
     """Get or create the global configuration instance"""
-    global config
-    if config is None:
-        config = Settings()
-        config.validate_repo_path()
-    return config
+    return _build_settings()
 
 
 def reset_config() -> None:
     """Reset the global configuration (useful for testing)"""
-    global config
-    config = None
+    _build_settings.cache_clear()
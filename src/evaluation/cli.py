@@ -61,9 +61,10 @@ async def main():
         test_suite = await loader.load_from_file(eval_config.test_cases_path)
         console.print(f"[green]✓ Loaded {len(test_suite.test_cases)} test cases[/green]\n")
 
-        # Create PM system
+        # Create PM system - evaluation exercises every component, so warm
+        # them concurrently instead of serially on first use
         console.print("[dim]Initializing PM Query System...[/dim]")
-        pm_system = PMQuerySystem()
+        pm_system = await PMQuerySystem.create_async()
         console.print("[green]✓ PM Query System initialized[/green]\n")
 
         # Create judges
@@ -82,10 +83,13 @@ async def main():
             judges=judges,
             max_concurrent=eval_config.max_concurrent_evaluations
         )
-        report = await runner.run_evaluation(test_suite.test_cases)
-
-        # Generate report
+        # Stream results into the reporter as they complete, then compose
+        # the final report once the whole suite is done
         reporter = JsonReporter(output_dir=eval_config.results_output_dir)
+        report = await runner.run_evaluation(
+            test_suite.test_cases,
+            on_result=reporter.append
+        )
         result_path = await reporter.generate_report(report)
 
         console.print(f"[green]✓ Results saved to: {result_path}[/green]\n")
@@ -3,8 +3,8 @@ Configuration management for evaluation system
 Uses Pydantic Settings for environment-based configuration
 """
 
+import functools
 from pathlib import Path
-from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -19,7 +19,7 @@ class EvaluationSettings(BaseSettings):
     results_output_dir: Path = Path("evaluation_results")
 
     # Execution settings
-    max_concurrent_evaluations: int = 3  # Run 3 tests in parallel
+    max_concurrent_evaluations: int = 4  # Test cases are I/O-bound subprocess waits
     evaluation_timeout: int = 900  # 15 minutes per test
 
     model_config = SettingsConfigDict(
@@ -31,19 +31,18 @@ class EvaluationSettings(BaseSettings):
     )
 
 
-# Global config instance
-eval_config: Optional[EvaluationSettings] = None
+# lru_cache instead of a manual global: env parsing and type coercion
+# run once, re-entry is a dict lookup, and thread safety comes for free
+@functools.lru_cache(maxsize=1)
+def _build_eval_settings() -> EvaluationSettings:
+    return EvaluationSettings()
 
 
 def get_eval_config() -> EvaluationSettings:
     """Get or create the global evaluation configuration instance"""
-    global eval_config
-    if eval_config is None:
-        eval_config = EvaluationSettings()
-    return eval_config
+    return _build_eval_settings()
 
 
 def reset_eval_config() -> None:
     """Reset the global evaluation configuration (useful for testing)"""
-    global eval_config
-    eval_config = None
+    _build_eval_settings.cache_clear()
@@ -3,7 +3,10 @@ Base judge protocol for evaluation system
 Defines interface that all judges must implement
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from typing import List, Tuple
+
 from src.evaluation.models import GroundTruth, IdeaCoverageResult
 
 
@@ -29,3 +32,25 @@ class BaseJudge(ABC):
             IdeaCoverageResult with coverage metrics
         """
         pass
+
+    async def evaluate_batch(
+        self,
+        items: List[Tuple[str, GroundTruth, str]]
+    ) -> List[IdeaCoverageResult]:
+        """
+        Evaluate several answers, returning results in input order
+
+        The default runs evaluate concurrently per item; judges that can
+        pack multiple items into one LLM request override this to cut
+        round-trips.
+
+        Args:
+            items: (answer, ground_truth, question) triples
+
+        Returns:
+            One IdeaCoverageResult per item, in order
+        """
+        return list(await asyncio.gather(*[
+            self.evaluate(answer, ground_truth, question)
+            for answer, ground_truth, question in items
+        ]))
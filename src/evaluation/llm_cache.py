@@ -0,0 +1,137 @@
+"""
+Evaluation LLM response cache
+Caches chat-completion contents on disk keyed by (model, messages,
+response_format) so repeated evaluator runs over the same test suite skip
+the API entirely - during dev iteration most judge calls are verbatim
+repeats of earlier ones
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# orjson serializes the key material and parses nothing here, but the
+# canonical dump of large message lists is on every call's path
+try:
+    import orjson
+
+    def _canonical_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+except ImportError:
+    def _canonical_dumps(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+from src.evaluation.rate_limiter import TokenBucket, estimate_tokens
+
+_DEFAULT_CACHE_DIR = Path.home() / ".cbagent" / "eval_llm_cache"
+
+# Hit/miss counters, surfaced so reporters can show how much of a run was
+# served from cache
+_STATS = {"hits": 0, "misses": 0}
+
+# Transient API failures are retried with full-jitter exponential backoff;
+# a lost judge call would otherwise fail the whole test case
+_MAX_ATTEMPTS = 6
+
+
+def cache_stats() -> Dict[str, int]:
+    """Return a snapshot of cache hit/miss counters for this process"""
+    return dict(_STATS)
+
+
+def _key_for(model: str, messages: List[dict], response_format: Optional[dict]) -> str:
+    payload = _canonical_dumps({"m": model, "msgs": messages, "rf": response_format})
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _read_fresh(path: Path, ttl_seconds: int) -> Optional[str]:
+    try:
+        if time.time() - path.stat().st_mtime > ttl_seconds:
+            return None
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+async def cached_chat(
+    client,
+    model: str,
+    messages: List[dict],
+    response_format: Optional[dict] = None,
+    cache_dir: Optional[Path] = None,
+    ttl_seconds: int = 7 * 86400,
+    bucket: Optional[TokenBucket] = None
+) -> str:
+    """
+    Run a chat completion through the disk cache
+
+    On a hit the stored message content is returned without touching the
+    network (and without consuming rate-limit budget); on a miss the call
+    is made with seed=0 for repeatability and the content is written
+    atomically for the next run. File IO goes through a worker thread so
+    the event loop never blocks.
+
+    Args:
+        client: AsyncOpenAI client to use on a miss
+        model: Model name (part of the cache key)
+        messages: Chat messages (part of the cache key)
+        response_format: Optional response_format dict (part of the key)
+        cache_dir: Cache directory (default: ~/.cbagent/eval_llm_cache/)
+        ttl_seconds: Entry time-to-live, enforced via file mtime
+        bucket: Optional TokenBucket acquired only when the API is hit
+
+    Returns:
+        The completion's message content
+    """
+    cache_dir = cache_dir or _DEFAULT_CACHE_DIR
+    key = _key_for(model, messages, response_format)
+    path = cache_dir / key[:2] / f"{key}.json"
+
+    cached = await asyncio.to_thread(_read_fresh, path, ttl_seconds)
+    if cached is not None:
+        _STATS["hits"] += 1
+        return cached
+
+    _STATS["misses"] += 1
+
+    if bucket is not None:
+        estimated = sum(estimate_tokens(m.get("content", "")) for m in messages)
+        await bucket.acquire(tokens=estimated)
+
+    kwargs = {"model": model, "messages": messages, "seed": 0}
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+
+    # Retry 429s and connection blips with full-jitter exponential
+    # backoff; anything else propagates immediately
+    from openai import APIConnectionError, APITimeoutError, RateLimitError
+
+    delay = 1.0
+    for attempt in range(_MAX_ATTEMPTS):
+        try:
+            response = await client.chat.completions.create(**kwargs)
+            break
+        except (RateLimitError, APITimeoutError, APIConnectionError):
+            if attempt == _MAX_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(min(delay, 30.0) * (0.5 + random.random()))
+            delay *= 2
+
+    if bucket is not None and response.usage is not None:
+        bucket.reconcile(estimated, response.usage.total_tokens)
+
+    content = response.choices[0].message.content
+    await asyncio.to_thread(_write_atomic, path, content)
+    return content
@@ -3,10 +3,18 @@ Test case loader for evaluation system
 Loads test cases from JSON files
 """
 
-import json
+import asyncio
 from pathlib import Path
+
+from pydantic import TypeAdapter
+
 from src.evaluation.models import TestSuite
 
+# One pydantic-core validator built at import; validate_json fuses JSON
+# parsing and per-test-case validation into a single Rust pass with no
+# intermediate Python dict tree
+_SUITE_ADAPTER = TypeAdapter(TestSuite)
+
 
 class TestCaseLoader:
     """Loads test cases from JSON file"""
@@ -24,12 +32,12 @@ class TestCaseLoader:
 
         Raises:
             FileNotFoundError: If file doesn't exist
-            json.JSONDecodeError: If JSON is invalid
-            ValidationError: If data doesn't match schema
+            ValidationError: If the JSON is invalid or doesn't match the schema
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return TestSuite(**data)
+        # Read in a worker thread - the method is async, so blocking the
+        # event loop on file IO would stall any in-flight API calls
+        raw = await asyncio.to_thread(file_path.read_bytes)
+        return _SUITE_ADAPTER.validate_json(raw)
 
     @staticmethod
     async def load_from_dict(data: dict) -> TestSuite:
@@ -42,4 +50,4 @@ class TestCaseLoader:
         Returns:
             TestSuite with loaded test cases
         """
-        return TestSuite(**data)
+        return _SUITE_ADAPTER.validate_python(data)
@@ -0,0 +1,108 @@
+"""
+OpenAI rate limiter for evaluation LLM callers
+Proactively meters requests/min and tokens/min so concurrent judges and
+dataset generation stay under the account limits instead of thrashing on
+429 responses and backoff
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, Tuple
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 chars per token) for pre-call metering"""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """
+    Async token bucket metering both requests/min and tokens/min
+
+    Capacity refills continuously based on elapsed time (no background
+    task); acquire() blocks until both budgets have room. Waiters are
+    serialized through a lock, which keeps wakeups fair and simple.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        """
+        Initialize the bucket at full capacity
+
+        Args:
+            rpm: Allowed requests per minute
+            tpm: Allowed tokens per minute
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last
+        self._last = now
+        self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60.0)
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Reserve one request plus the estimated token cost, waiting if needed
+
+        Args:
+            tokens: Estimated prompt+completion tokens for the call
+        """
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._requests >= 1.0 and self._tokens >= tokens:
+                    self._requests -= 1.0
+                    self._tokens -= tokens
+                    return
+                # Sleep just long enough for the tighter budget to refill
+                wait_requests = (1.0 - self._requests) * 60.0 / self.rpm
+                wait_tokens = (tokens - self._tokens) * 60.0 / self.tpm
+                await asyncio.sleep(max(wait_requests, wait_tokens, 0.05))
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """
+        Correct the token budget once the real usage is known
+
+        Args:
+            estimated: Tokens reserved before the call
+            actual: response.usage.total_tokens reported by the API
+        """
+        self._tokens -= actual - estimated
+
+
+# One bucket per (api_key, model) so independent accounts/models don't
+# throttle each other, while every caller on the same pair shares a budget
+_BUCKETS: Dict[Tuple[str, str], TokenBucket] = {}
+
+
+def get_bucket(api_key: str, model: str) -> TokenBucket:
+    """
+    Get or create the shared bucket for an (api_key, model) pair
+
+    Limits come from OPENAI_RPM / OPENAI_TPM; the defaults are generous
+    enough to be invisible on paid tiers while still preventing unbounded
+    bursts from concurrent evaluation.
+
+    Args:
+        api_key: OpenAI API key the caller uses
+        model: Model name the caller targets
+
+    Returns:
+        Shared TokenBucket instance
+    """
+    key = (api_key, model)
+    bucket = _BUCKETS.get(key)
+    if bucket is None:
+        bucket = TokenBucket(
+            rpm=int(os.getenv("OPENAI_RPM", "500")),
+            tpm=int(os.getenv("OPENAI_TPM", "200000"))
+        )
+        _BUCKETS[key] = bucket
+    return bucket
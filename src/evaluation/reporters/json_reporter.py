@@ -3,12 +3,13 @@ JSON Reporter - Generates evaluation results as JSON + console summary
 Saves results to file and displays rich console summary
 """
 
+import asyncio
 import json
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 
-from src.evaluation.models import EvaluationReport
+from src.evaluation.models import EvaluationReport, TestCaseResult
 from src.evaluation.reporters.base import BaseReporter
 
 console = Console()
@@ -26,6 +27,33 @@ class JsonReporter(BaseReporter):
         """
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._partial_path = None
+        self._partial_file = None
+
+    async def append(self, result: TestCaseResult) -> None:
+        """
+        Append one result to an in-progress JSON Lines file
+
+        Completed test cases hit disk as soon as they finish, so a crashed
+        or interrupted run still leaves recoverable partial results. The
+        final JSON report is composed from the full EvaluationReport in
+        generate_report as before.
+
+        Args:
+            result: Completed test case result to persist
+        """
+        if self._partial_file is None:
+            self._partial_path = self.output_dir / "evaluation_in_progress.jsonl"
+            self._partial_file = open(self._partial_path, 'w', encoding='utf-8')
+
+        line = json.dumps(
+            result.model_dump(mode='json'),
+            ensure_ascii=False,
+            separators=(',', ':'),
+            default=str
+        )
+        self._partial_file.write(line + "\n")
+        self._partial_file.flush()
 
     async def generate_report(self, report: EvaluationReport) -> Path:
         """
@@ -41,20 +69,46 @@ class JsonReporter(BaseReporter):
         timestamp = report.timestamp.strftime("%Y%m%d_%H%M%S")
         json_path = self.output_dir / f"{timestamp}_evaluation_results.json"
 
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(
-                report.model_dump(mode='json'),
-                f,
-                indent=2,
-                ensure_ascii=False,
-                default=str  # Handle datetime serialization
-            )
+        # Stream the report to disk record-by-record in a worker thread so
+        # a large suite neither doubles peak memory with one giant JSON
+        # string nor blocks the event loop on file IO
+        await asyncio.to_thread(self._write_report, json_path, report)
+
+        # The final report supersedes the incremental JSONL
+        if self._partial_file is not None:
+            self._partial_file.close()
+            self._partial_file = None
+            self._partial_path.unlink(missing_ok=True)
+            self._partial_path = None
 
         # Print console summary
         self._print_summary(report)
 
         return json_path
 
+    @staticmethod
+    def _write_report(json_path: Path, report: EvaluationReport) -> None:
+        """
+        Write the report JSON with results streamed one record at a time
+
+        The header fields are serialized without the results list, then
+        each TestCaseResult is dumped and written individually - peak
+        memory stays at one serialized result rather than the whole
+        report. Output is compact (no indent); each record is still one
+        pydantic-core pass.
+        """
+        with open(json_path, 'w', encoding='utf-8') as f:
+            # model_dump_json(exclude=...) ends with '}'; splice the
+            # streamed results array in before closing the object
+            head = report.model_dump_json(exclude={"results"})
+            f.write(head[:-1])
+            f.write(',"results":[')
+            for i, result in enumerate(report.results):
+                if i:
+                    f.write(',')
+                f.write(result.model_dump_json())
+            f.write(']}')
+
     def _print_summary(self, report: EvaluationReport):
         """Print summary to console"""
 
@@ -4,11 +4,16 @@ Runs test cases through PM system and evaluates results
 """
 
 import asyncio
+import json
+import os
+import time
 from datetime import datetime
-from typing import List
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
 from rich.console import Console
 from rich.progress import Progress
 
+from src.cache.llm_cache import DiskBackend, LLMCache, make_cache_key
 from src.main import PMQuerySystem
 from src.evaluation.models import (
     TestCase, TestCaseResult, EvaluationReport,
@@ -19,6 +24,30 @@ from src.evaluation.judges.base import BaseJudge
 console = Console()
 
 
+class _RunningStats:
+    """Single-pass count/sum/min/max aggregator for a stream of scores"""
+
+    __slots__ = ("n", "total", "min", "max")
+
+    def __init__(self):
+        self.n = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def push(self, value: float) -> None:
+        self.n += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.n
+
+
 class EvaluationRunner:
     """Runs evaluation pipeline on test cases"""
 
@@ -26,7 +55,7 @@ class EvaluationRunner:
         self,
         pm_system: PMQuerySystem,
         judges: List[BaseJudge],
-        max_concurrent: int = 3
+        max_concurrent: int = 4
     ):
         """
         Initialize evaluation runner
@@ -34,22 +63,96 @@ class EvaluationRunner:
         Args:
             pm_system: PMQuerySystem instance for running queries
             judges: List of judges to evaluate answers
-            max_concurrent: Maximum concurrent test evaluations (default: 3)
+            max_concurrent: Maximum concurrent test evaluations (default: 4)
         """
         self.pm_system = pm_system
         self.judges = judges
         self.max_concurrent = max_concurrent
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        # Complete answer triples persist across evaluation runs: a hit
+        # skips the Codex analysis and both translator calls for that
+        # question, which dominate wall time when re-running a suite after
+        # a judge or prompt tweak. Near-duplicate (paraphrased) questions
+        # can also hit via the semantic index, behind the same opt-in
+        # switch the agents use
+        self._answer_cache = LLMCache(
+            DiskBackend(Path.home() / ".cbagent" / "eval_answer_cache"),
+            ttl_seconds=7 * 86400,
+            use_semantic=bool(os.getenv("CBAGENT_GENERATIVE_CACHE"))
+        )
 
-    async def run_evaluation(
+    async def stream_evaluation(
         self,
         test_cases: List[TestCase]
+    ) -> AsyncIterator[TestCaseResult]:
+        """
+        Run all test cases, yielding each result as soon as it completes
+
+        Consumers (reporters, progress displays) can process results while
+        slower test cases are still running, instead of waiting for the
+        whole suite.
+
+        A fixed pool of max_concurrent workers pulls cases from a queue,
+        so exactly that many evaluations are in flight at a time. Compared
+        to one task per test case behind a semaphore, only O(max_concurrent)
+        task frames exist regardless of suite size and there is no
+        per-case lock contention.
+
+        Args:
+            test_cases: List of test cases to evaluate
+
+        Yields:
+            TestCaseResult per test case, in completion order
+        """
+        pending: asyncio.Queue = asyncio.Queue()
+        for test_case in test_cases:
+            pending.put_nowait(test_case)
+
+        completed: asyncio.Queue = asyncio.Queue()
+
+        async def worker() -> None:
+            while True:
+                try:
+                    test_case = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    result = await self._evaluate_test_case(test_case)
+                except BaseException as e:
+                    # _evaluate_test_case converts failures into error
+                    # results; anything escaping it (cancellation, bugs)
+                    # must still unblock the consumer
+                    completed.put_nowait(e)
+                    raise
+                completed.put_nowait(result)
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(self.max_concurrent, len(test_cases)))
+        ]
+
+        try:
+            for _ in test_cases:
+                item = await completed.get()
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            for task in workers:
+                if not task.done():
+                    task.cancel()
+
+    async def run_evaluation(
+        self,
+        test_cases: List[TestCase],
+        on_result: Optional[Callable[[TestCaseResult], Awaitable[None]]] = None
     ) -> EvaluationReport:
         """
         Run evaluation on all test cases
 
         Args:
             test_cases: List of test cases to evaluate
+            on_result: Optional async callback invoked with each result as
+                it completes (e.g. a reporter appending incremental output)
 
         Returns:
             EvaluationReport with complete results
@@ -60,29 +163,31 @@ class EvaluationRunner:
 
         start_time = datetime.now()
 
-        # Run test cases with concurrency limit
-        tasks = [
-            self._evaluate_test_case(tc)
-            for tc in test_cases
-        ]
-
         with Progress() as progress:
             task = progress.add_task(
                 "[cyan]Evaluating...",
                 total=len(test_cases)
             )
 
+            # Summary statistics accumulate as results stream in, so no
+            # second pass over the (potentially large) results list is
+            # needed at the end
+            coverage_stats: dict = {}
+            time_stats = _RunningStats()
+            successful = 0
+
             results = []
-            for coro in asyncio.as_completed(tasks):
-                result = await coro
+            async for result in self.stream_evaluation(test_cases):
                 results.append(result)
+                if result.error is None:
+                    successful += 1
+                    self._accumulate_stats(result, coverage_stats, time_stats)
+                if on_result is not None:
+                    await on_result(result)
                 progress.update(task, advance=1)
 
-        # Calculate summary statistics
-        successful = sum(1 for r in results if r.error is None)
         failed = len(results) - successful
-
-        summary_stats = self._calculate_summary_stats(results)
+        summary_stats = self._summarize_stats(coverage_stats, time_stats)
 
         return EvaluationReport(
             timestamp=start_time,
@@ -106,129 +211,210 @@ class EvaluationRunner:
         Returns:
             TestCaseResult with evaluation results
         """
-        async with self.semaphore:
-            start_time = datetime.now()
-
-            try:
-                # Get all three answer formats from PM system
-                answers = await self._get_answers(test_case.question)
-
-                # Evaluate each answer format with all judges
-                evaluations = []
-                for answer_type, answer_text in [
-                    ("brief", answers.brief),
-                    ("detailed", answers.detailed),
-                    ("raw", answers.raw)
-                ]:
-                    # Run all judges on this answer
-                    judge_results = await asyncio.gather(*[
-                        judge.evaluate(
-                            answer=answer_text,
-                            ground_truth=test_case.ground_truth,
-                            question=test_case.question
-                        )
-                        for judge in self.judges
-                    ])
-
-                    # We currently only have one judge (idea coverage)
-                    idea_coverage = judge_results[0]
-
-                    evaluations.append(AnswerEvaluation(
-                        answer_type=answer_type,
-                        answer_text=answer_text,
-                        idea_coverage=idea_coverage
-                    ))
-
-                execution_time = (datetime.now() - start_time).total_seconds()
-
-                return TestCaseResult(
-                    test_case_id=test_case.id,
-                    question=test_case.question,
-                    ground_truth=test_case.ground_truth,
-                    answers=answers,
-                    evaluations=evaluations,
-                    execution_time=execution_time,
-                    error=None
+        # Concurrency is bounded by the worker pool in stream_evaluation,
+        # so no per-case gating is needed here. perf_counter is monotonic
+        # (immune to wall-clock adjustments) and avoids two datetime
+        # allocations per case
+        start = time.perf_counter()
+
+        try:
+            # Get all three answer formats and their judgments; on a cache
+            # miss the brief and raw answers are judged while the detailed
+            # answer is still generating
+            answers, judge_batches = await self._judged_answers(test_case)
+
+            # We currently only have one judge (idea coverage)
+            idea_coverage_batch = judge_batches[0]
+
+            answer_items = [
+                ("brief", answers.brief),
+                ("detailed", answers.detailed),
+                ("raw", answers.raw)
+            ]
+            evaluations = [
+                AnswerEvaluation(
+                    answer_type=answer_type,
+                    answer_text=answer_text,
+                    idea_coverage=idea_coverage
                 )
+                for (answer_type, answer_text), idea_coverage
+                in zip(answer_items, idea_coverage_batch)
+            ]
 
-            except Exception as e:
-                execution_time = (datetime.now() - start_time).total_seconds()
-
-                return TestCaseResult(
-                    test_case_id=test_case.id,
-                    question=test_case.question,
-                    ground_truth=test_case.ground_truth,
-                    answers=AnswerFormats(brief="", detailed="", raw=""),
-                    evaluations=[],
-                    execution_time=execution_time,
-                    error=str(e)
-                )
+            execution_time = time.perf_counter() - start
+
+            return TestCaseResult(
+                test_case_id=test_case.id,
+                question=test_case.question,
+                ground_truth=test_case.ground_truth,
+                answers=answers,
+                evaluations=evaluations,
+                execution_time=execution_time,
+                error=None
+            )
+
+        except Exception as e:
+            execution_time = time.perf_counter() - start
+
+            return TestCaseResult(
+                test_case_id=test_case.id,
+                question=test_case.question,
+                ground_truth=test_case.ground_truth,
+                answers=AnswerFormats(brief="", detailed="", raw=""),
+                evaluations=[],
+                execution_time=execution_time,
+                error=str(e)
+            )
 
-    async def _get_answers(self, question: str) -> AnswerFormats:
+    async def _judge_items(self, items: list) -> list:
+        """Run one (answer, ground_truth, question) batch through every judge"""
+        # Single-judge deployments (the current default) skip the gather
+        # machinery - wrapping one coroutine in gather allocates a future
+        # and a task per call for nothing
+        if len(self.judges) == 1:
+            return [await self.judges[0].evaluate_batch(items)]
+        return await asyncio.gather(*[
+            judge.evaluate_batch(items) for judge in self.judges
+        ])
+
+    async def _judged_answers(self, test_case: TestCase) -> tuple:
         """
-        Get all three answer formats from PM system
+        Get all three answer formats and judge them, pipelined
+
+        On an answer-cache hit all three formats are judged as one batch
+        per judge. On a miss the brief and raw answers are judged as soon
+        as the brief translation resolves - overlapping with the (slower)
+        detailed generation - and the detailed answer is judged in a
+        second, smaller batch when it arrives. That takes one generation's
+        judge latency off the critical path at the cost of one extra judge
+        request per judge.
 
         Args:
-            question: Question to ask
+            test_case: Test case supplying the question and ground truth
 
         Returns:
-            AnswerFormats with brief, detailed, and raw answers
+            Tuple of (AnswerFormats, per-judge result lists in
+            brief/detailed/raw order)
         """
+        question = test_case.question
+        ground_truth = test_case.ground_truth
+
+        # Content-addressed key: entries from an older repo state stop
+        # matching as soon as HEAD moves
+        cache_key = make_cache_key(
+            self.pm_system.config.repo_path,
+            question,
+            self.pm_system.current_commit
+        )
+        cached = await self._answer_cache.get(cache_key, query_text=question)
+        if cached is not None:
+            answers = AnswerFormats(**json.loads(cached))
+            batches = await self._judge_items([
+                (answers.brief, ground_truth, question),
+                (answers.detailed, ground_truth, question),
+                (answers.raw, ground_truth, question)
+            ])
+            return answers, batches
+
         # Get technical analysis (raw output)
         technical_output = await self.pm_system.technical_agent.analyze_query(question)
 
-        # Get brief and detailed translations in parallel
-        brief_task = self.pm_system.translator_agent._generate_brief(
-            technical_output, question
+        # Start both translations, then judge brief+raw while detailed is
+        # still generating
+        brief_task = asyncio.ensure_future(
+            self.pm_system.translator_agent._generate_brief(
+                technical_output, question
+            )
         )
-        detailed_task = self.pm_system.translator_agent._generate_detailed(
-            technical_output, question
+        detailed_task = asyncio.ensure_future(
+            self.pm_system.translator_agent._generate_detailed(
+                technical_output, question
+            )
         )
 
-        brief, detailed = await asyncio.gather(brief_task, detailed_task)
-
-        return AnswerFormats(
+        try:
+            brief = await brief_task
+        except BaseException:
+            detailed_task.cancel()
+            raise
+
+        early_task = asyncio.ensure_future(self._judge_items([
+            (brief, ground_truth, question),
+            (technical_output, ground_truth, question)
+        ]))
+
+        try:
+            detailed = await detailed_task
+        except BaseException:
+            early_task.cancel()
+            raise
+
+        late_batches = await self._judge_items([
+            (detailed, ground_truth, question)
+        ])
+        early_batches = await early_task
+
+        answers = AnswerFormats(
             brief=brief,
             detailed=detailed,
             raw=technical_output
         )
+        await self._answer_cache.set(
+            cache_key, answers.model_dump_json(), query_text=question
+        )
 
-    def _calculate_summary_stats(
-        self,
-        results: List[TestCaseResult]
+        # Reassemble per judge into brief/detailed/raw order
+        batches = [
+            [early[0], late[0], early[1]]
+            for early, late in zip(early_batches, late_batches)
+        ]
+        return answers, batches
+
+    @staticmethod
+    def _accumulate_stats(
+        result: TestCaseResult,
+        coverage_stats: dict,
+        time_stats: "_RunningStats"
+    ) -> None:
+        """
+        Fold one successful result into the running aggregators
+
+        Args:
+            result: A completed test case result without error
+            coverage_stats: Per-answer-type _RunningStats, keyed by type
+            time_stats: Aggregator for execution times
+        """
+        for evaluation in result.evaluations:
+            stats = coverage_stats.get(evaluation.answer_type)
+            if stats is None:
+                stats = coverage_stats[evaluation.answer_type] = _RunningStats()
+            stats.push(evaluation.idea_coverage.coverage_score)
+
+        time_stats.push(result.execution_time)
+
+    @staticmethod
+    def _summarize_stats(
+        coverage_stats: dict,
+        time_stats: "_RunningStats"
     ) -> dict:
         """
-        Calculate summary statistics across all results
+        Flatten the running aggregators into the summary_stats dict
 
         Args:
-            results: List of test case results
+            coverage_stats: Per-answer-type _RunningStats, keyed by type
+            time_stats: Aggregator for execution times
 
         Returns:
             Dictionary with summary statistics
         """
-        successful_results = [r for r in results if r.error is None]
-
-        if not successful_results:
-            return {}
-
-        # Calculate average coverage by answer type
         stats = {}
-        for answer_type in ["brief", "detailed", "raw"]:
-            scores = [
-                eval.idea_coverage.coverage_score
-                for r in successful_results
-                for eval in r.evaluations
-                if eval.answer_type == answer_type
-            ]
-
-            if scores:
-                stats[f"{answer_type}_avg_coverage"] = sum(scores) / len(scores)
-                stats[f"{answer_type}_min_coverage"] = min(scores)
-                stats[f"{answer_type}_max_coverage"] = max(scores)
-
-        # Average execution time
-        exec_times = [r.execution_time for r in successful_results]
-        if exec_times:
-            stats["avg_execution_time"] = sum(exec_times) / len(exec_times)
+        for answer_type, running in coverage_stats.items():
+            if running.n:
+                stats[f"{answer_type}_avg_coverage"] = running.avg
+                stats[f"{answer_type}_min_coverage"] = running.min
+                stats[f"{answer_type}_max_coverage"] = running.max
+
+        if time_stats.n:
+            stats["avg_execution_time"] = time_stats.avg
 
         return stats
@@ -5,24 +5,82 @@ Interactive CLI for querying Git repositories for component information
 """
 
 import asyncio
+import functools
+import os
+import re
+import signal
 from pathlib import Path
 from typing import Optional
 from rich.console import Console
-from rich.prompt import Prompt
 from rich.panel import Panel
-from rich.markdown import Markdown
 from prompt_toolkit import PromptSession
-from prompt_toolkit.history import InMemoryHistory
+from prompt_toolkit.history import FileHistory
 from dotenv import load_dotenv
 
 from src.config import get_config
 from src.agents.technical_agent import TechnicalAgent
 from src.agents.translator_agent import TranslatorAgent
-from git import Repo
+from src.cache.cache_manager import CacheManager, _head_stamp, _read_head_sha
+from src.cache.llm_cache import _ensure_dir
+from src.queries.parser import QueryParser
+
+_HISTORY_PATH = Path.home() / ".cbagent" / "history"
+_HISTORY_MAX_LINES = 5000
+
+# Follow-up questions speculatively warmed after a component query, hiding
+# Codex latency behind the user's reading time (opt-in via CBAGENT_PREFETCH)
+_PREFETCH_TEMPLATES = (
+    "What does {component} depend on?",
+    "What are the restrictions for {component}?"
+)
 
 
 console = Console()
 
+# Queries anchored to the current moment ("what changed today?") can give
+# a different answer every time they are asked, so cached entries must not
+# be served for them - repo-state drift is already handled by the cache's
+# commit invalidation, but wall-clock drift is not
+_TEMPORAL_RE = re.compile(
+    r"\b(today|yesterday|now|currently|recent(?:ly)?|latest"
+    r"|this (?:week|month|year)|last (?:week|month|year|night))\b",
+    re.IGNORECASE
+)
+
+
+def _prompt_history(path: Path = _HISTORY_PATH) -> FileHistory:
+    """
+    Open the persistent prompt history, trimming it if oversized
+
+    Queries survive across sessions instead of living in an unbounded
+    in-memory list; trimming to the newest _HISTORY_MAX_LINES at startup
+    keeps both the file and prompt_toolkit's load time bounded.
+    """
+    _ensure_dir(path.parent)
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+        if len(lines) > _HISTORY_MAX_LINES:
+            path.write_text("".join(lines[-_HISTORY_MAX_LINES:]), encoding="utf-8")
+    except OSError:
+        pass
+    return FileHistory(str(path))
+
+
+@functools.lru_cache(maxsize=8)
+def _head_commit(repo_path: Path, head_stamp: tuple) -> Optional[str]:
+    """
+    Short HEAD commit for a repository, memoized per (path, HEAD stamp)
+
+    GitPython's Repo() scans config and walks refs on construction just to
+    answer this; a direct read keyed by the HEAD change stamp makes repeat
+    lookups cost a couple of stats instead. The stamp covers .git/HEAD AND
+    the branch ref it points to - a plain commit only touches the ref file,
+    so keying on the HEAD mtime alone would keep returning the pre-commit
+    sha.
+    """
+    sha = _read_head_sha(repo_path)
+    return sha[:7] if sha else None
+
 
 class SessionState:
     """Tracks session state for progressive disclosure"""
@@ -30,6 +88,9 @@ class SessionState:
     def __init__(self):
         self.last_query: Optional[str] = None
         self.last_detailed: Optional[str] = None
+        # Parsed rich renderable for last_detailed, built on first 'more'
+        # and reused on repeats
+        self.last_detailed_renderable = None
         self.last_technical: Optional[str] = None
 
 
@@ -41,32 +102,119 @@ class PMQuerySystem:
         load_dotenv(override=True)
         self.config = get_config()
 
-        # Initialize components
-        self.technical_agent = TechnicalAgent(
+        self.session_state = SessionState()
+
+        # Background task finishing the detailed explanation (and cache
+        # write) for the last query; 'more' awaits it if still running
+        self._pending_detailed: Optional[asyncio.Task] = None
+
+        # Questions already speculatively warmed this session
+        self._prefetched: set = set()
+        self._parser = QueryParser()
+
+        # Repository root for HEAD lookups (handle both single repos and
+        # directories with multiple repos - the latter resolve to no commit)
+        self._repo_path = Path(self.config.repo_path)
+
+        # The welcome and status panels only depend on configuration and
+        # the startup commit - build them once instead of re-rendering the
+        # f-strings on every help/status command
+        self._welcome_panel = self._build_welcome_panel()
+        self._status_panel = self._build_status_panel()
+
+        # Display methods print this separator several times per query;
+        # compute it once and refresh only when the terminal is resized
+        self._sep = "━" * console.width
+        if hasattr(signal, "SIGWINCH"):
+            try:
+                signal.signal(
+                    signal.SIGWINCH,
+                    lambda *_: setattr(self, "_sep", "━" * console.width)
+                )
+            except ValueError:
+                # Not on the main thread - keep the startup-width separator
+                pass
+
+    @property
+    def current_commit(self) -> Optional[str]:
+        """
+        Short HEAD commit, re-resolved when the repository moves
+
+        A property rather than a constructor-time snapshot because the
+        evaluation runner folds this into its answer-cache keys per query -
+        a commit made mid-process must rotate those keys, not serve answers
+        for the old tree. Steady-state cost is the stamp's stats; the sha
+        read itself is memoized per stamp.
+        """
+        stamp = _head_stamp(self._repo_path)
+        if not stamp:
+            # Not a single git repo - might be a directory of repos
+            return None
+        return _head_commit(self._repo_path, stamp)
+
+    @classmethod
+    async def create_async(cls) -> "PMQuerySystem":
+        """
+        Construct a system with all components warmed up concurrently
+
+        Callers that will exercise every component immediately (the
+        evaluation harness) can overlap the independent constructions -
+        Codex executor setup, OpenAI client pooling, SQLite open - in
+        worker threads instead of paying them serially on first use.
+        """
+        system = cls()
+        # Touching each cached_property in its own thread triggers the
+        # lazy constructions in parallel
+        await asyncio.gather(
+            asyncio.to_thread(lambda: system.technical_agent),
+            asyncio.to_thread(lambda: system.translator_agent),
+            asyncio.to_thread(lambda: system.cache)
+        )
+        return system
+
+    # The agents and the answer cache are constructed on first use rather
+    # than in __init__: help/status-only sessions never pay Codex or OpenAI
+    # setup, and callers exercising a single agent (evaluation harnesses,
+    # tests) can stub the others by assigning the attribute directly
+
+    @functools.cached_property
+    def technical_agent(self):
+        """Codex-backed technical analysis agent (built on first access)"""
+        if os.getenv("CBAGENT_MOCK"):
+            # Lazy import - keeps the mock module off the normal import path
+            from src.agents.mocks import MockTechnicalAgent
+            technical_agent_cls = MockTechnicalAgent
+        else:
+            technical_agent_cls = TechnicalAgent
+
+        return technical_agent_cls(
             api_key=None,  # Codex CLI uses session auth via 'codex login'
             model=None,    # Codex CLI determines model automatically
             repo_path=self.config.repo_path
         )
 
-        self.translator_agent = TranslatorAgent(
+    @functools.cached_property
+    def translator_agent(self):
+        """Business-translation agent (built on first access)"""
+        return TranslatorAgent(
             api_key=self.config.openai_api_key,
             model=self.config.translator_agent_model
         )
 
-        self.session_state = SessionState()
+    @functools.cached_property
+    def cache(self):
+        """
+        Persistent answer cache (built on first access)
 
-        # Get repository info (handle both single repos and directories with multiple repos)
-        self.repo = None
-        self.current_commit = None
-        try:
-            self.repo = Repo(self.config.repo_path)
-            self.current_commit = self.repo.head.commit.hexsha[:7]
-        except Exception:
-            # Not a single git repo - might be a directory containing multiple repos
-            pass
+        Translated answers persist across sessions: repeating a query
+        (same model, same normalized text) skips the Codex analysis and
+        both translation calls. Entries are invalidated when HEAD moves
+        and evicted LRU beyond the size cap.
+        """
+        return CacheManager(self.config.repo_path)
 
-    def show_welcome(self):
-        """Display welcome banner"""
+    def _build_welcome_panel(self) -> Panel:
+        """Render the static welcome banner"""
         status_line = f"Status: Up to date (commit: {self.current_commit})" if self.current_commit else "Status: Multiple repositories"
         welcome_text = f"""[bold cyan]PM Component Query System[/bold cyan]
 Repository: {self.config.repo_path}
@@ -85,86 +233,169 @@ Commands:
   • [bold]help[/bold] - Show this help message
   • [bold]exit[/bold] or [bold]quit[/bold] - Exit the program
 """
-        console.print(Panel(welcome_text, border_style="cyan"))
+        return Panel(welcome_text, border_style="cyan")
+
+    def show_welcome(self):
+        """Display welcome banner"""
+        console.print(self._welcome_panel)
 
     async def process_query(self, user_input: str):
         """Process a user query by sending it directly to Codex"""
         console.print(f"\n[dim]Analyzing your query...[/dim]")
 
+        # Content-addressed lookup: model + normalized query, with commit
+        # invalidation handled inside CacheManager. Time-anchored queries
+        # bypass the cache entirely
+        cache_key = f"{self.config.translator_agent_model}|{user_input.strip().lower()}"
+        cacheable = _TEMPORAL_RE.search(user_input) is None
+        # SQLite IO runs in a worker thread so concurrent process_query
+        # calls (the evaluation runner drives several at once) do not
+        # serialize on the event loop
+        entry = (
+            await asyncio.to_thread(self.cache.get, cache_key, "answer")
+            if cacheable else None
+        )
+        if entry is not None:
+            console.print("[dim]✓ Served from cache[/dim]\n")
+            self._display_brief(user_input, entry.brief_output)
+
+            self.session_state.last_query = user_input
+            self.session_state.last_detailed = entry.detailed_output
+            self.session_state.last_detailed_renderable = None
+            # Raw technical output is not cached; 'raw' requires a fresh query
+            self.session_state.last_technical = None
+            # Any older in-flight detailed task no longer matters here
+            # (its publish guard keeps it from clobbering this state)
+            self._pending_detailed = None
+            return
+
+        detailed_task = None
         try:
-            # Send query directly to Codex (no parsing!)
-            technical_output = await self.technical_agent.analyze_query(user_input)
+            # Send query directly to Codex (no parsing!). The temporal
+            # bypass must reach the agent's own disk cache too, or a
+            # "what changed today?" would be answered from a prior day's
+            # cached analysis one layer down
+            technical_output = await self.technical_agent.analyze_query(
+                user_input, use_cache=cacheable
+            )
             console.print("[dim]✓ Agentic workflow complete[/dim]")
             console.print("[dim]Generating final answer...[/dim]")
 
             # Translate to business language (parallel execution)
-            brief_task = self.translator_agent._generate_brief(technical_output, user_input)
-            detailed_task = self.translator_agent._generate_detailed(technical_output, user_input)
+            detailed_task = asyncio.ensure_future(
+                self.translator_agent._generate_detailed(technical_output, user_input)
+            )
 
             # Wait for brief first and display immediately
-            brief = await brief_task
+            brief = await self.translator_agent._generate_brief(technical_output, user_input)
             console.print("[dim]✓ Result generated[/dim]\n")
 
             # Display brief immediately
             self._display_brief(user_input, brief)
 
-            # Wait for detailed in background
-            detailed = await detailed_task
-
         except Exception as e:
+            if detailed_task is not None:
+                detailed_task.cancel()
             console.print(f"[red]❌ Error: {str(e)}[/red]")
             return
 
         # Store for "more" and "raw" commands
         self.session_state.last_query = user_input
-        self.session_state.last_detailed = detailed
+        self.session_state.last_detailed = None
+        self.session_state.last_detailed_renderable = None
         self.session_state.last_technical = technical_output
 
-    def _display_brief(self, query: str, brief: str):
-        """Display just the brief summary"""
-        # Header
-        console.print("━" * console.width)
-        console.print(f"[bold]Query:[/bold] {query}")
-        console.print("━" * console.width)
+        # Don't hold the prompt hostage while the detailed explanation
+        # finishes - the user is reading the brief. A background task
+        # stores it (and writes the cache entry) when it lands; 'more'
+        # awaits the task if it is still running.
+        async def _finish_detailed():
+            try:
+                detailed = await detailed_task
+            except Exception as e:
+                console.print(f"\n[red]❌ Detailed explanation failed: {str(e)}[/red]")
+                return
+            # Only publish if no newer query has replaced this one
+            if self.session_state.last_query == user_input:
+                self.session_state.last_detailed = detailed
+            if cacheable:
+                await asyncio.to_thread(
+                    self.cache.set, cache_key, "answer", brief, detailed
+                )
 
-        # Brief summary
-        console.print("\n[bold cyan]📄 Quick Summary[/bold cyan]\n")
-        console.print(brief)
+        self._pending_detailed = asyncio.ensure_future(_finish_detailed())
 
-        # Prompt for more details
-        console.print("\n" + "━" * console.width)
-        console.print("[dim]💡 Want more details?[/dim]")
-        console.print("[dim]   Type 'more' to see full explanation[/dim]")
-        console.print("━" * console.width)
-        console.print()
+        if os.getenv("CBAGENT_PREFETCH"):
+            self._prefetch_followups(user_input)
+
+    def _prefetch_followups(self, user_input: str) -> None:
+        """
+        Warm the Codex analysis for likely follow-up questions
 
-    def _display_result(self, query: str, brief: str, detailed: str):
-        """Display query result with progressive disclosure"""
+        While the user reads the brief, background tasks run the technical
+        analysis for the follow-ups the welcome banner suggests
+        (dependencies, restrictions) so a matching next query starts from
+        a warm cache instead of a cold Codex run. Opt-in because it spends
+        quota on guesses; concurrency is bounded by the executor's global
+        Codex semaphore.
+        """
+        component, _ = self._parser.parse(user_input)
+        if not component:
+            return
+
+        for template in _PREFETCH_TEMPLATES:
+            question = template.format(component=component)
+            if question in self._prefetched:
+                continue
+            self._prefetched.add(question)
+            task = asyncio.ensure_future(self.technical_agent.analyze_query(question))
+            # Speculative - failures must stay silent and unretrieved
+            # exceptions must not warn at shutdown
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    def _display_brief(self, query: str, brief: str):
+        """Display just the brief summary"""
         # Header
-        console.print("━" * console.width)
+        console.print(self._sep)
         console.print(f"[bold]Query:[/bold] {query}")
-        console.print("━" * console.width)
+        console.print(self._sep)
 
         # Brief summary
         console.print("\n[bold cyan]📄 Quick Summary[/bold cyan]\n")
         console.print(brief)
 
         # Prompt for more details
-        console.print("\n" + "━" * console.width)
+        console.print("\n" + self._sep)
         console.print("[dim]💡 Want more details?[/dim]")
         console.print("[dim]   Type 'more' to see full explanation[/dim]")
-        console.print("━" * console.width)
+        console.print(self._sep)
         console.print()
 
-    def show_more(self):
+    async def show_more(self):
         """Show detailed explanation from last query"""
+        # The detailed explanation may still be generating in the background
+        if self._pending_detailed is not None:
+            if not self._pending_detailed.done():
+                console.print("[dim]Finishing detailed explanation...[/dim]")
+            await self._pending_detailed
+            self._pending_detailed = None
+
         if not self.session_state.last_detailed:
             console.print("[yellow]No previous query to show details for.[/yellow]")
             return
 
+        # The detailed output is markdown-structured; parse it into a rich
+        # renderable once and reuse it on repeated 'more' calls - Markdown
+        # is lazily imported since only this path needs it
+        if self.session_state.last_detailed_renderable is None:
+            from rich.markdown import Markdown
+            self.session_state.last_detailed_renderable = Markdown(
+                self.session_state.last_detailed
+            )
+
         console.print("\n[bold cyan]📋 Detailed Explanation[/bold cyan]\n")
-        console.print(self.session_state.last_detailed)
-        console.print("\n" + "━" * console.width + "\n")
+        console.print(self.session_state.last_detailed_renderable)
+        console.print("\n" + self._sep + "\n")
 
     def show_raw(self):
         """Show raw technical output from TechnicalAgent"""
@@ -174,10 +405,10 @@ Commands:
 
         console.print("\n[bold cyan]🔧 Raw Technical Output[/bold cyan]\n")
         console.print(self.session_state.last_technical)
-        console.print("\n" + "━" * console.width + "\n")
+        console.print("\n" + self._sep + "\n")
 
-    def show_status(self):
-        """Show system status"""
+    def _build_status_panel(self) -> Panel:
+        """Render the static system status panel"""
         commit_info = f"Current commit: {self.current_commit}" if self.current_commit else "Multiple repositories"
         status_text = f"""[bold]Repository Status[/bold]
 Path: {self.config.repo_path}
@@ -187,22 +418,25 @@ Path: {self.config.repo_path}
 Technical Agent: OpenAI Codex CLI (JSON mode)
 Translator Agent: {self.config.translator_agent_model}
 """
-        console.print(Panel(status_text, title="System Status", border_style="blue"))
+        return Panel(status_text, title="System Status", border_style="blue")
+
+    def show_status(self):
+        """Show system status"""
+        console.print(self._status_panel)
 
     async def run(self):
         """Main interactive loop"""
         self.show_welcome()
 
-        # Create prompt session with history
-        session = PromptSession(history=InMemoryHistory())
+        # Create prompt session with persistent, size-capped history
+        session = PromptSession(history=_prompt_history())
 
         while True:
             try:
-                # Get user input
-                user_input = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: session.prompt("\n❯ ")
-                )
+                # Get user input - prompt_toolkit's native async prompt
+                # integrates with the running loop directly, so no executor
+                # thread is spun up per prompt cycle
+                user_input = await session.prompt_async("\n❯ ")
 
                 user_input = user_input.strip()
 
@@ -215,7 +449,7 @@ Translator Agent: {self.config.translator_agent_model}
                     break
 
                 elif user_input.lower() == "more":
-                    self.show_more()
+                    await self.show_more()
 
                 elif user_input.lower() == "raw":
                     self.show_raw()
@@ -2,6 +2,7 @@
 Query Parser - Detects query type and extracts component name from natural language
 """
 
+import functools
 import re
 from typing import Tuple, Optional
 from enum import Enum
@@ -16,6 +17,48 @@ class QueryType(Enum):
     UNKNOWN = "unknown"
 
 
+# All component-extraction patterns fused into one compiled alternation,
+# so extraction is a single scan instead of up to eight full passes over
+# the query. The alternation sits inside a zero-width lookahead: matches
+# do not consume text, so each named group finds exactly the matches its
+# former standalone pattern would have - groups are listed in precedence
+# order, and extraction dispatches on which groups matched. The phrase
+# groups keep their case-insensitivity via scoped (?i:...) flags.
+_COMPONENT_RE = re.compile(
+    r'(?=["\'](?P<quoted>[A-Z][a-zA-Z0-9_]*)["\']'
+    r'|(?:the|for|about|of|use|using)\s+(?P<prefixed>[A-Z][a-zA-Z0-9_]+)'
+    r'|\b(?P<pascal>[A-Z][a-z]+(?:[A-Z][a-z]+)+)\b'
+    r'|[a-z]\s+(?P<word>[A-Z][a-zA-Z0-9_]{2,})\b'
+    r'|(?i:(?:use|using)\s+(?:the\s+)?(?P<use_phrase>[a-zA-Z][a-zA-Z0-9_]+))'
+    r'|(?i:(?:about|regarding)\s+(?:the\s+)?(?P<about_phrase>[a-zA-Z][a-zA-Z0-9_]+))'
+    r'|(?i:(?P<component_phrase>[a-zA-Z][a-zA-Z0-9_]+)\s+component)'
+    r'|(?i:(?P<feature_phrase>[a-zA-Z][a-zA-Z0-9_]+)\s+feature))'
+)
+
+# Phrase-group hits get their first letter capitalized on the way out
+_PHRASE_GROUPS = ("use_phrase", "about_phrase", "component_phrase", "feature_phrase")
+
+
+def _compile_keyword_re(groups: dict) -> "re.Pattern":
+    """
+    Fuse per-category keyword lists into one alternation pattern
+
+    One compiled regex scans the query in a single C-level pass instead of
+    ~40 Python-level substring checks. Each category becomes a named group
+    so the match reports which list it came from; within a group, longer
+    keywords are listed first so e.g. "requirement" is not shadowed by
+    "require" at the same position.
+    """
+    parts = []
+    for name, keywords in groups.items():
+        alternation = "|".join(
+            re.escape(keyword)
+            for keyword in sorted(keywords, key=len, reverse=True)
+        )
+        parts.append(f"(?P<{name}>{alternation})")
+    return re.compile("|".join(parts))
+
+
 class QueryParser:
     """
     Parses natural language queries to extract:
@@ -49,6 +92,24 @@ class QueryParser:
         "process", "policy"
     ]
 
+    # Categories are checked in this order; the first one with a keyword
+    # hit wins, matching the original cascade of any() scans. Group names
+    # are the QueryType values, listed in the same priority order so
+    # alternation ties at a position resolve toward the higher-priority
+    # category.
+    _TYPE_PRIORITY = (
+        QueryType.USAGE,
+        QueryType.RESTRICTIONS,
+        QueryType.DEPENDENCIES,
+        QueryType.BUSINESS_RULES
+    )
+    _KEYWORD_RE = _compile_keyword_re({
+        QueryType.USAGE.value: USAGE_KEYWORDS,
+        QueryType.RESTRICTIONS.value: RESTRICTION_KEYWORDS,
+        QueryType.DEPENDENCIES.value: DEPENDENCY_KEYWORDS,
+        QueryType.BUSINESS_RULES.value: BUSINESS_RULE_KEYWORDS
+    })
+
     def parse(self, query: str) -> Tuple[Optional[str], QueryType]:
         """
         Parse a natural language query
@@ -59,6 +120,16 @@ class QueryParser:
         Returns:
             Tuple of (component_name, query_type)
         """
+        # Retries and repeated phrasings are common in an interactive
+        # loop; identical queries (including the (None, USAGE) negative
+        # parses) come straight from the memo instead of re-running the
+        # regex work. Keyed on the stripped original - lowercasing would
+        # merge queries whose component extraction is case-sensitive.
+        return self._parse_cached(query.strip())
+
+    @functools.lru_cache(maxsize=512)
+    def _parse_cached(self, query: str) -> Tuple[Optional[str], QueryType]:
+        """Uncached parse body behind the per-instance LRU memo"""
         query_lower = query.lower()
 
         # Detect query type
@@ -71,18 +142,17 @@ class QueryParser:
 
     def _detect_query_type(self, query: str) -> QueryType:
         """Detect the type of query based on keywords"""
-        # Check each category
-        if any(keyword in query for keyword in self.USAGE_KEYWORDS):
-            return QueryType.USAGE
-
-        if any(keyword in query for keyword in self.RESTRICTION_KEYWORDS):
-            return QueryType.RESTRICTIONS
-
-        if any(keyword in query for keyword in self.DEPENDENCY_KEYWORDS):
-            return QueryType.DEPENDENCIES
-
-        if any(keyword in query for keyword in self.BUSINESS_RULE_KEYWORDS):
-            return QueryType.BUSINESS_RULES
+        # One linear scan collects every matched category; usage is the
+        # top priority, so it can short-circuit immediately
+        seen = set()
+        for match in self._KEYWORD_RE.finditer(query):
+            if match.lastgroup == QueryType.USAGE.value:
+                return QueryType.USAGE
+            seen.add(match.lastgroup)
+
+        for query_type in self._TYPE_PRIORITY:
+            if query_type.value in seen:
+                return query_type
 
         # Default to usage if unclear
         return QueryType.USAGE
@@ -96,42 +166,35 @@ class QueryParser:
         - Quoted strings
         - Words after "the" or "for"
         """
-        # Try to find quoted component names first
-        quoted_match = re.search(r'["\']([A-Z][a-zA-Z0-9_]*)["\']', query)
-        if quoted_match:
-            return quoted_match.group(1)
-
-        # Look for patterns like "the ComponentName" or "for ComponentName" first
-        # This helps avoid matching sentence-starting words
-        pattern_match = re.search(r'(?:the|for|about|of|use|using)\s+([A-Z][a-zA-Z0-9_]+)', query)
-        if pattern_match:
-            return pattern_match.group(1)
-
-        # Look for PascalCase component names (must have multiple capital letters or be long)
-        # Avoid single-word sentence starters like "How", "What", etc.
-        pascal_case_matches = re.findall(r'\b([A-Z][a-z]+(?:[A-Z][a-z]+)+)\b', query)
-        if pascal_case_matches:
+        # One scan: record the first hit per group (all hits for pascal,
+        # which wants the longest), then dispatch in precedence order -
+        # quoted > prefixed ("the X") > PascalCase > capitalized word >
+        # the common phrases
+        candidates = {}
+        pascal_matches = []
+        for match in _COMPONENT_RE.finditer(query):
+            group = match.lastgroup
+            if group == "pascal":
+                pascal_matches.append(match.group("pascal"))
+            elif group not in candidates:
+                candidates[group] = match.group(group)
+
+        if "quoted" in candidates:
+            return candidates["quoted"]
+
+        if "prefixed" in candidates:
+            return candidates["prefixed"]
+
+        if pascal_matches:
             # Return the longest match to avoid short words
-            return max(pascal_case_matches, key=len)
-
-        # Look for any capitalized word that might be a component (but not at sentence start)
-        # Match words that appear after lowercase words
-        word_match = re.search(r'[a-z]\s+([A-Z][a-zA-Z0-9_]{2,})\b', query)
-        if word_match:
-            return word_match.group(1)
-
-        # Try to extract from common phrases (case insensitive)
-        phrases = [
-            r'(?:use|using)\s+(?:the\s+)?([a-zA-Z][a-zA-Z0-9_]+)',
-            r'(?:about|regarding)\s+(?:the\s+)?([a-zA-Z][a-zA-Z0-9_]+)',
-            r'([a-zA-Z][a-zA-Z0-9_]+)\s+component',
-            r'([a-zA-Z][a-zA-Z0-9_]+)\s+feature'
-        ]
-
-        for pattern in phrases:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                component = match.group(1)
+            return max(pascal_matches, key=len)
+
+        if "word" in candidates:
+            return candidates["word"]
+
+        for group in _PHRASE_GROUPS:
+            if group in candidates:
+                component = candidates[group]
                 # Capitalize first letter
                 return component[0].upper() + component[1:]
 
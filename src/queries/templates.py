@@ -2,13 +2,19 @@
 Query Templates - Pre-defined prompts for different query types
 """
 
+import functools
 from typing import Dict
 
 
+@functools.lru_cache(maxsize=256)
 def get_query_template(query_type: str, component_name: str, repo_path: str) -> str:
     """
     Get the query template for a specific query type
 
+    The function is pure (templates are import-time constants), so results
+    are memoized - repo_path is fixed for a session and components recur,
+    making repeat calls a dict hit instead of a ~600-char format walk.
+
     Args:
         query_type: Type of query (usage, restrictions, dependencies, business_rules)
         component_name: Name of the component to analyze
@@ -17,15 +23,11 @@ def get_query_template(query_type: str, component_name: str, repo_path: str) ->
     Returns:
         Formatted query template
     """
-    templates: Dict[str, str] = {
-        "usage": USAGE_TEMPLATE,
-        "restrictions": RESTRICTIONS_TEMPLATE,
-        "dependencies": DEPENDENCIES_TEMPLATE,
-        "business_rules": BUSINESS_RULES_TEMPLATE
-    }
-
-    template = templates.get(query_type, USAGE_TEMPLATE)
-    return template.format(component_name=component_name, repo_path=repo_path)
+    template = _TEMPLATES.get(query_type, USAGE_TEMPLATE)
+    return template.format_map({
+        "component_name": component_name,
+        "repo_path": repo_path
+    })
 
 
 # Template for usage queries
@@ -114,12 +116,26 @@ Search in:
 Focus on identifying WHY the code does what it does from a business perspective."""
 
 
+# Dispatch table built once at module load - get_query_template only does a
+# dict lookup plus one format per call
+_TEMPLATES: Dict[str, str] = {
+    "usage": USAGE_TEMPLATE,
+    "restrictions": RESTRICTIONS_TEMPLATE,
+    "dependencies": DEPENDENCIES_TEMPLATE,
+    "business_rules": BUSINESS_RULES_TEMPLATE
+}
+
+
+# Built once at module load; callers on hot display paths can use
+# QUERY_DESCRIPTIONS.get(...) directly instead of the function wrapper
+QUERY_DESCRIPTIONS: Dict[str, str] = {
+    "usage": "Find examples, parameters, and integration steps",
+    "restrictions": "Identify limitations, constraints, and edge cases",
+    "dependencies": "List required packages and related components",
+    "business_rules": "Explain validation logic and business workflows"
+}
+
+
 def get_query_description(query_type: str) -> str:
     """Get a human-readable description of what each query type finds"""
-    descriptions = {
-        "usage": "Find examples, parameters, and integration steps",
-        "restrictions": "Identify limitations, constraints, and edge cases",
-        "dependencies": "List required packages and related components",
-        "business_rules": "Explain validation logic and business workflows"
-    }
-    return descriptions.get(query_type, "General component analysis")
+    return QUERY_DESCRIPTIONS.get(query_type, "General component analysis")